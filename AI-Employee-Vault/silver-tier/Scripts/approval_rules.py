@@ -0,0 +1,251 @@
+"""
+Handbook approval rules as data, compiled into a single-pass scanner.
+  - AmountRule  — any `$N` amount above a threshold
+  - KeywordRule — a trigger word followed, later on the same line, by a target word
+                  (or the trigger alone when there are no targets)
+
+RuleEngine tokenizes the text once (words, dollar amounts, line breaks) and
+feeds every token to a word → rule lookup table, so all rules are evaluated in
+one linear pass — no per-rule regex, no `.*` backtracking.
+
+HandbookRules compiles the rule set from the "Approval Rules" table in
+Company_Handbook.md and recompiles only when the handbook changes. It fails
+closed: a built-in rule stays in force unless a table row decides its category.
+"""
+
+from pathlib import Path
+from typing import NamedTuple
+import hashlib
+import logging
+import os
+import re
+
+
+class AmountRule(NamedTuple):
+    name: str
+    threshold: float
+    reason: str  # formatted with {amount} and {threshold}
+
+
+class KeywordRule(NamedTuple):
+    name: str
+    triggers: frozenset[str]
+    targets: frozenset[str]
+    reason: str
+
+
+class RuleMatch(NamedTuple):
+    rule: str
+    reason: str
+    offset: int  # character offset where the rule was satisfied
+
+
+AMOUNT_REASON = "Payment amount ${amount} exceeds ${threshold} threshold"
+PAYMENT_AMOUNT = "payment_amount"
+
+EXTERNAL_COMMS = KeywordRule(
+    "external_comms",
+    frozenset({"send", "email", "message"}),
+    frozenset({"external", "client", "vendor", "outside"}),
+    "Contains external communication — requires first-time approval",
+)
+
+DESTRUCTIVE_ACTION = KeywordRule(
+    "destructive_action",
+    frozenset({"delete", "remove"}),
+    frozenset({"shared", "team", "production"}),
+    "Destructive action on shared resource",
+)
+
+DEFAULT_RULES: list[AmountRule | KeywordRule] = [
+    AmountRule(PAYMENT_AMOUNT, 100, AMOUNT_REASON),
+    EXTERNAL_COMMS,
+    DESTRUCTIVE_ACTION,
+]
+
+# Handbook "Action" cell → rule. Rows matching none of these (e.g. "Modifying
+# Company_Handbook.md") describe actions the loop never sees in task content —
+# or are worded in a way the compiler does not know, so they are warned about.
+HANDBOOK_ROWS = [
+    (re.compile(r"(?i)\bpayment\s*>\s*\$\s*(\d+(?:\.\d+)?)"),
+     lambda m: AmountRule(PAYMENT_AMOUNT, float(m.group(1)), AMOUNT_REASON)),
+    (re.compile(r"(?i)\b(send|sending|email|message)\b.*\bextern"),
+     lambda m: EXTERNAL_COMMS),
+    (re.compile(r"(?i)\b(delet|remov)\w*\b"),
+     lambda m: DESTRUCTIVE_ACTION),
+]
+
+
+class RuleEngine:
+    """Evaluates every rule in one pass and reports each rule that matched.
+
+    Matches come back in rule order, one per rule (its first occurrence).
+    Word matching is case-insensitive on whole words, like `\\bword\\b`.
+    """
+    # An amount swallows trailing word characters: in `$5abc`, `abc` is not a whole word
+    TOKEN_RE = re.compile(r"\$\s*(\d+(?:\.\d+)?)\w*|\w+|\n")
+
+    def __init__(self, rules: list[AmountRule | KeywordRule]):
+        self.rules = list(rules)
+        self.amount_rules = [(i, r) for i, r in enumerate(self.rules) if isinstance(r, AmountRule)]
+        self.triggers: dict[str, list[int]] = {}
+        self.targets: dict[str, list[int]] = {}
+        for i, rule in enumerate(self.rules):
+            if isinstance(rule, KeywordRule):
+                for word in rule.triggers:
+                    self.triggers.setdefault(word.lower(), []).append(i)
+                for word in rule.targets:
+                    self.targets.setdefault(word.lower(), []).append(i)
+
+    def evaluate(self, content: str) -> list[RuleMatch]:
+        found: dict[int, RuleMatch] = {}
+        armed: set[int] = set()  # keyword rules whose trigger appeared on this line
+
+        for token in self.TOKEN_RE.finditer(content):
+            if len(found) == len(self.rules):
+                break
+            text = token.group(0)
+
+            if text == "\n":
+                armed.clear()
+                continue
+
+            if (amount := token.group(1)) is not None:
+                if "\n" in text:
+                    armed.clear()  # `$` and its digits may sit on different lines
+                for i, rule in self.amount_rules:
+                    if i not in found and float(amount) > rule.threshold:
+                        reason = rule.reason.format(amount=amount, threshold=f"{rule.threshold:g}")
+                        found[i] = RuleMatch(rule.name, reason, token.start())
+                continue
+
+            word = text.lower()
+            for i in self.targets.get(word, ()):
+                if i in armed and i not in found:
+                    found[i] = RuleMatch(self.rules[i].name, self.rules[i].reason, token.start())
+            for i in self.triggers.get(word, ()):
+                if i not in found:
+                    if self.rules[i].targets:
+                        armed.add(i)
+                    else:
+                        found[i] = RuleMatch(self.rules[i].name, self.rules[i].reason, token.start())
+
+        return [found[i] for i in sorted(found)]
+
+
+# ── Handbook-compiled rules ───────────────────────────────────────────────────
+def parse_rules_table(text: str) -> list[list[str]] | None:
+    """Rows (as cell lists) of the table under the "Approval Rules" heading, or None."""
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if line.startswith("#") and "approval rules" in line.lower():
+            break
+    else:
+        return None
+
+    rows = []
+    in_table = False
+    for line in lines[i + 1:]:
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            in_table = True
+            cells = [cell.strip() for cell in stripped.strip("|").split("|")]
+            if all(set(cell) <= set("-: ") for cell in cells):
+                continue  # divider row
+            rows.append(cells)
+        elif in_table or stripped.startswith("#"):
+            break
+    return rows[1:] if rows else None  # drop the header row
+
+
+def compile_handbook(text: str) -> tuple[list[AmountRule | KeywordRule], list[str], list[str]] | None:
+    """Rules required by the handbook table, the required actions no rule could be
+    compiled for, and the built-in rules kept because no row decided their category.
+
+    A category is decided by any row the compiler recognizes, "Yes" or "No" —
+    so only an explicit "No" turns a built-in rule off, never an unrecognized row.
+    """
+    rows = parse_rules_table(text)
+    if rows is None:
+        return None
+    rules: list[AmountRule | KeywordRule] = []
+    decided: set[str] = set()
+    skipped = []
+    for cells in rows:
+        if len(cells) < 2:
+            continue
+        action, required = cells[0], cells[1]
+        is_required = required.lower().startswith("yes")
+        for pattern, build in HANDBOOK_ROWS:
+            if match := pattern.search(action):
+                rule = build(match)
+                decided.add(rule.name)
+                if is_required and rule.name not in (r.name for r in rules):
+                    rules.append(rule)
+                break
+        else:
+            if is_required:
+                skipped.append(action)
+    kept = [rule for rule in DEFAULT_RULES if rule.name not in decided]
+    return rules + kept, skipped, [rule.name for rule in kept]
+
+
+class HandbookRules:
+    """The approval RuleEngine compiled from Company_Handbook.md, hot-reloaded.
+
+    current() costs one stat while the handbook is unchanged; a new mtime/size
+    triggers a re-read, and only a new content hash triggers a recompile. The
+    returned version (a short content hash, or "builtin" when the handbook or
+    its table is missing) identifies the rule set a decision was made under.
+    """
+
+    def __init__(self, path: Path, logger: logging.Logger):
+        self.path = path
+        self.logger = logger
+        self.stat_key: tuple[int, int] | None = None
+        self.version = "builtin"
+        self.engine = RuleEngine(DEFAULT_RULES)
+        self.loaded = False
+
+    def current(self) -> tuple[RuleEngine, str]:
+        try:
+            st = os.stat(self.path)
+            stat_key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stat_key = None
+        if self.loaded and stat_key == self.stat_key:
+            return self.engine, self.version
+        self.stat_key = stat_key
+        self.loaded = True
+        self._reload()
+        return self.engine, self.version
+
+    def _reload(self) -> None:
+        try:
+            raw = self.path.read_bytes()
+        except OSError:
+            if self.version != "builtin":
+                self.logger.warning(f"{self.path.name} unreadable — using built-in approval rules")
+            self.engine, self.version = RuleEngine(DEFAULT_RULES), "builtin"
+            return
+
+        version = hashlib.blake2b(raw, digest_size=6).hexdigest()
+        if version == self.version:
+            return  # touched, not changed
+
+        compiled = compile_handbook(raw.decode("utf-8", errors="replace"))
+        if compiled is None:
+            self.logger.warning(f"No Approval Rules table in {self.path.name} — using built-in approval rules")
+            self.engine, self.version = RuleEngine(DEFAULT_RULES), "builtin"
+            return
+
+        rules, skipped, kept = compiled
+        self.engine, self.version = RuleEngine(rules), version
+        self.logger.info(
+            f"  Approval rules loaded from {self.path.name} (version {version}): "
+            + (", ".join(r.name for r in rules) or "none")
+        )
+        for action in skipped:
+            self.logger.warning(f"  Handbook rule not checked on task content: {action}")
+        for name in kept:
+            self.logger.warning(f"  No handbook row decides {name} — keeping the built-in rule")
@@ -0,0 +1,131 @@
+"""
+Shared Dashboard.md writer for the watcher and the reasoning loop.
+Buffers activity rows and folder counts in memory and flushes them in one
+atomic rewrite per debounce window — skipped entirely when nothing rendered changed.
+"""
+
+from pathlib import Path
+from datetime import datetime
+import logging
+import re
+import threading
+import time
+
+from vault_io import DurableWriter
+
+ACTIVITY_DIVIDER = "|------|--------|---------|"
+
+LAST_UPDATED_PATTERN = r"(🕐 Last updated \| ).+"
+
+# (pattern, folder key) — status table first, then folder overview table
+COUNT_PATTERNS = [
+    (r"(📥 Inbox items \| )\d+", "inbox"),
+    (r"(⚡ Needs_Action items \| )\d+", "action"),
+    (r"(✅ Done items \| )\d+", "done"),
+    (r"(📥 `/Inbox` \| )\d+", "inbox"),
+    (r"(⚡ `/Needs_Action` \| )\d+", "action"),
+    (r"(✅ `/Done` \| )\d+", "done"),
+    (r"(⏳ Awaiting approval \| )\d+", "awaiting"),
+]
+
+
+class DashboardWriter:
+    """Coalesces Dashboard.md updates into one rewrite per debounce window.
+
+    Activity rows are queued as blocks — each block lands directly under the
+    Recent Activity divider, newest block on top. Without the table, the
+    block's fallback lines are appended to the end of the file instead.
+    Counts keep only the latest value. Safe to call from worker threads.
+    """
+
+    def __init__(self, path: Path, logger: logging.Logger, durable: DurableWriter,
+                 debounce: float = 0.0):
+        self.path = path
+        self.durable = durable
+        self.logger = logger
+        self.debounce = debounce
+        self.blocks: list[list[str]] = []
+        self.fallback: list[str] = []
+        self.counts: dict[str, int] | None = None
+        self.pending_since: float | None = None
+        self.lock = threading.Lock()
+
+    def _mark_pending(self) -> None:
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+
+    def add_activity(self, rows: list[str], fallback: list[str] | None = None) -> None:
+        """Queue a block of activity rows (and their no-table fallback lines)."""
+        if not rows:
+            return
+        with self.lock:
+            self.blocks.append(rows)
+            self.fallback.extend(fallback or [])
+            self._mark_pending()
+
+    def set_counts(self, counts: dict[str, int]) -> None:
+        """Queue folder counts keyed inbox / action / done (/ awaiting)."""
+        with self.lock:
+            self.counts = dict(counts)
+            self._mark_pending()
+
+    def seconds_until_due(self) -> float | None:
+        """Time left in the current debounce window, or None if nothing is buffered."""
+        with self.lock:
+            if self.pending_since is None:
+                return None
+            return max(0.0, self.pending_since + self.debounce - time.monotonic())
+
+    def flush(self, force: bool = False) -> bool:
+        """Write buffered changes if the debounce window has closed. Returns True on write."""
+        with self.lock:
+            if self.pending_since is None:
+                return False
+            if not force and time.monotonic() - self.pending_since < self.debounce:
+                return False
+            blocks, fallback, counts = self.blocks, self.fallback, self.counts
+            self.blocks, self.fallback, self.counts = [], [], None
+            self.pending_since = None
+
+        if not self.path.exists():
+            self.logger.warning("Dashboard.md not found, skipping dashboard update")
+            return False
+
+        try:
+            content = self.path.read_text(encoding="utf-8")
+            updated = content
+
+            if counts:
+                for pattern, key in COUNT_PATTERNS:
+                    if key in counts:
+                        updated = re.sub(pattern, f"\\g<1>{counts[key]}", updated)
+
+            rows = [row for block in reversed(blocks) for row in block]
+            if rows and ACTIVITY_DIVIDER in updated:
+                updated = updated.replace(
+                    ACTIVITY_DIVIDER,
+                    ACTIVITY_DIVIDER + "\n" + "\n".join(rows),
+                    1
+                )
+            elif fallback:
+                updated += "".join(f"\n{line}\n" for line in fallback)
+
+            if updated == content:
+                self.logger.debug("  Dashboard unchanged — write skipped")
+                return False
+
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            updated = re.sub(LAST_UPDATED_PATTERN, f"\\g<1>{timestamp} |", updated)
+
+            self.durable.write_text(self.path, updated)
+        except Exception as e:
+            self.logger.error(f"Failed updating Dashboard.md: {e}")
+            return False
+
+        summary = f"  Dashboard updated: {len(rows)} activity row(s)"
+        if counts:
+            summary += f" | Inbox={counts.get('inbox')} | Action={counts.get('action')} | Done={counts.get('done')}"
+            if "awaiting" in counts:
+                summary += f" | Awaiting={counts['awaiting']}"
+        self.logger.info(summary)
+        return True
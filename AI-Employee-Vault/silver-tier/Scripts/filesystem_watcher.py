@@ -1,31 +1,83 @@
 """
 Bronze Tier - Filesystem Watcher v3.0
-Monitors /Inbox for new files every 10 seconds.
+Monitors /Inbox for new files — event-driven via inotify on Linux,
+falls back to polling every 10 seconds elsewhere.
 Uses Python logging module → console (colored) + /Logs/watcher.log (append).
 On detection: wraps file with metadata → /Needs_Action, appends activity to Dashboard.md.
+Exact re-drops of recently ingested content are linked to the existing note instead;
+near-duplicates are ingested but marked `near_duplicate_of` the note they resemble.
 """
 
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from datetime import datetime
 import argparse
+import codecs
+import errno
+import hashlib
+import io
+import json
 import logging
-import re
+import os
+import shutil
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, TextIO
+
+from dashboard import DashboardWriter
+from near_duplicates import NearDuplicateIndex, sketch
+from note_moves import NoteMoves
+from vault_counters import FolderCounters
+from vault_io import DURABILITY_LEVELS, DurableWriter, NameAllocator
+from vault_layout import VaultLayout
+from vault_watch import InotifyWatch
 
 # ── Config ────────────────────────────────────────────────────────────────────
 DEFAULT_VAULT = r"E:\Personal-AI-Employee-Hackathon-0\AI-Employee-Vault\bronze-tier"
-POLL_INTERVAL = 10  # seconds
+POLL_INTERVAL = 10  # seconds — base poll interval
+POLL_MAX_INTERVAL = 60  # seconds — idle back-off cap
+WATCH_BACKEND = "auto"  # auto | inotify | poll
+EVENT_RESCAN = 60  # seconds — safety rescan while idle in event mode
+SETTLE_SECONDS = 1.0  # a file must keep the same size + mtime this long before ingest (unless inotify reported it finished)
+RETRY_SECONDS = 30  # a file whose ingest failed is released again after this long
+WRAP_CHUNK = 64 * 1024  # characters streamed per read/write when wrapping
+PREVIEW_CHARS = 200
+DETECTED_ENTRY = "Detected in /Inbox by Watcher, processed to /Needs_Action"  # first action-log entry
+SNIFF_BYTES = 8 * 1024  # head bytes inspected to tell text from binary
+
+WORKERS = 1  # ingest threads per cycle
+DURABILITY = "batch"  # none | batch | always — see vault_io.DurableWriter
+DASHBOARD_DEBOUNCE = 2.0  # seconds — Dashboard.md rewritten at most once per window
 
-processed_files: set[str] = set()
+LEDGER_MAX_ENTRIES = 100_000
+LEDGER_TTL_DAYS = 90
+DEDUP_TTL_DAYS = 7  # identical content seen this recently is a duplicate (0 disables)
+NEAR_DUP_THRESHOLD = 0.8  # estimated Jaccard similarity that marks a near-duplicate (0 disables)
+NEAR_DUP_MAX_ENTRIES = 100_000  # ~2 KB of memory each
+NEAR_DUP_TTL_DAYS = 30
 
 # Globals — set after arg parse
 VAULT_PATH: Path
 INBOX: Path
 NEEDS_ACTION: Path
 DONE: Path
+ATTACHMENTS: Path
 LOGS: Path
 LOG_FILE: Path
+STATE: Path
+
+ledger: "IngestLedger"
+near_dups: NearDuplicateIndex | None = None
+note_moves: NoteMoves  # where the reasoning loop archived notes — read-only here
+layout: VaultLayout
+needs_action_names: NameAllocator  # allocator for the current /Needs_Action shard
+names_lock = threading.Lock()
+dashboard: DashboardWriter
+counters: FolderCounters
+durable: DurableWriter
+inbox_scanner: "InboxScanner"
+poller: "AdaptivePoller"
 
 logger = logging.getLogger("watcher")
 
@@ -82,30 +134,249 @@ def now_short() -> str:
     return datetime.now().strftime("%H:%M")
 
 
-# ── Core Functions ────────────────────────────────────────────────────────────
-def wrap_with_metadata(source: Path) -> str:
-    """Read original content and wrap in .md metadata envelope."""
-    timestamp = now_str()
+# ── Inbox Watch ───────────────────────────────────────────────────────────────
+class AdaptivePoller:
+    """Poll schedule for when event watching is unavailable (network shares, WSL mounts).
+
+    Burst mode: while cycles keep finding files, poll again immediately.
+    Otherwise start from the base interval and double it on every empty
+    cycle, up to the cap — an idle vault quietly backs off.
+    """
 
+    def __init__(self, base: float, cap: float):
+        self.base = base
+        self.cap = max(cap, base)
+        self.interval = base
+        self.queue_depth = 0
+
+    def record(self, found: int, settling: int) -> float:
+        """Update the schedule from one cycle's results; returns the next delay."""
+        self.queue_depth = found + settling
+        if found:
+            self.interval = 0.0
+        elif self.interval == 0.0:
+            self.interval = self.base
+        else:
+            self.interval = min(self.cap, self.interval * 2)
+        return self.interval
+
+
+def open_inbox_watch() -> InotifyWatch | None:
+    """Return an inotify watch on /Inbox, or None to use the poll loop."""
+    if WATCH_BACKEND == "poll":
+        return None
     try:
-        full_content = source.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        logger.warning(f"Binary file detected: {source.name}, storing as reference")
-        full_content = f"[Binary or unreadable file: {source.name}]"
-    except PermissionError:
-        logger.error(f"Permission denied reading: {source.name}")
-        full_content = f"[Permission denied: {source.name}]"
+        return InotifyWatch(INBOX, logger, collect=True)
+    except OSError as e:
+        if WATCH_BACKEND == "inotify":
+            logger.critical(f"inotify backend requested but unavailable: {e}")
+            sys.exit(1)
+        logger.warning(f"inotify unavailable ({e}) — falling back to adaptive polling")
+        return None
 
-    preview = full_content[:200]
-    if len(full_content) > 200:
-        preview += "\n... (truncated)"
 
+# ── Processed-File Ledger ─────────────────────────────────────────────────────
+class IngestLedger:
+    """Persistent record of ingested Inbox files, keyed by (name, size, mtime_ns).
+
+    Backed by an append-only JSON-lines log in /.state, replayed into an
+    insertion-ordered dict at startup. Each entry also stores the content hash
+    and the note the content was filed as. Entries expire after ttl_seconds or
+    once max_entries is exceeded (oldest first); the log is compacted once dead
+    lines outnumber live entries.
+
+    A second dict maps each digest to its newest entry, which makes the ledger
+    a content-addressed dedup cache: original() finds the note for a digest in
+    O(1). A duplicate is recorded too, pointing at the same note — so content
+    that keeps arriving stays at the young end and is evicted last (LRU).
+
+    claim() makes the check atomic: a digest being filed is held by its drop
+    until record() (or release() on failure), and identical drops in the same
+    burst wait for that outcome instead of racing it.
+    """
+
+    def __init__(self, path: Path, max_entries: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: dict[tuple[str, int, int], tuple[str, float, str]] = {}  # key -> (digest, ts, note)
+        self.by_digest: dict[str, tuple[str, int, int]] = {}
+        self.claims: dict[str, str] = {}  # digest -> Inbox name filing it right now
+        self.log_lines = 0
+        self.lock = threading.Lock()
+        self.claim_done = threading.Condition(self.lock)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._evict(time.time())
+        if self.log_lines > 2 * len(self.entries):
+            self._compact()
+        self._log = self.path.open("a", encoding="utf-8")
+
+    def _load(self) -> None:
+        try:
+            f = self.path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                self.log_lines += 1
+                try:
+                    ts, name, size, mtime_ns, digest, *rest = json.loads(line)
+                except ValueError:
+                    continue  # torn trailing line from a crash — ignore
+                self._put((name, size, mtime_ns), digest, ts, rest[0] if rest else "")
+
+    def _put(self, key: tuple[str, int, int], digest: str, ts: float, note: str) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = (digest, ts, note)
+        if digest:
+            self.by_digest[digest] = key
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.ttl_seconds
+        while self.entries:
+            oldest = next(iter(self.entries))
+            digest, ts, _ = self.entries[oldest]
+            if len(self.entries) <= self.max_entries and ts >= cutoff:
+                break
+            del self.entries[oldest]
+            if self.by_digest.get(digest) == oldest:
+                del self.by_digest[digest]
+
+    def _compact(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for (name, size, mtime_ns), (digest, ts, note) in self.entries.items():
+                f.write(json.dumps([ts, name, size, mtime_ns, digest, note]) + "\n")
+        os.replace(tmp, self.path)
+        self.log_lines = len(self.entries)
+
+    def seen(self, name: str, st: os.stat_result) -> bool:
+        """O(1) check — has this exact (name, size, mtime) already been ingested?"""
+        return (name, st.st_size, st.st_mtime_ns) in self.entries
+
+    def _original(self, digest: str, max_age: float) -> str | None:
+        if not digest or (key := self.by_digest.get(digest)) is None:
+            return None
+        entry = self.entries.get(key)
+        if entry is None or not entry[2] or time.time() - entry[1] > max_age:
+            return None
+        return entry[2]
+
+    def claim(self, digest: str, name: str, max_age: float) -> str | None:
+        """Atomic dedup check — the vault path of the note this content was filed as
+        within max_age, or None once the digest is claimed for the drop called name.
+
+        Waits while another drop holds the digest: its note is the original if it
+        is filed, and the claim passes to this drop if it fails.
+        """
+        if not digest:
+            return None
+        with self.claim_done:
+            while (holder := self.claims.get(digest)) is not None and holder != name:
+                self.claim_done.wait()
+            if original := self._original(digest, max_age):
+                return original
+            self.claims[digest] = name
+            return None
+
+    def release(self, name: str) -> None:
+        """Drop the claims of a drop that failed to file, waking anyone waiting on them."""
+        with self.claim_done:
+            for digest in [d for d, holder in self.claims.items() if holder == name]:
+                del self.claims[digest]
+            self.claim_done.notify_all()
+
+    def record(self, name: str, st: os.stat_result, digest: str, note: str = "") -> None:
+        """Record an ingested file; note is the vault path of the note it was filed as."""
+        now = time.time()
+        key = (name, st.st_size, st.st_mtime_ns)
+        with self.claim_done:
+            self._put(key, digest, now, note)
+            self._log.write(json.dumps([now, name, st.st_size, st.st_mtime_ns, digest, note]) + "\n")
+            self.log_lines += 1
+            self._evict(now)
+            if self.claims.get(digest) == name:
+                del self.claims[digest]
+                self.claim_done.notify_all()
+
+    def flush(self) -> None:
+        """Persist appended records; compact the log if it has grown stale."""
+        with self.lock:
+            self._log.flush()
+            if self.log_lines > 2 * max(len(self.entries), 1024):
+                self._log.close()
+                self._compact()
+                self._log = self.path.open("a", encoding="utf-8")
+
+
+class HashingReader(io.RawIOBase):
+    """Raw byte stream that hashes everything read through it."""
+
+    def __init__(self, raw: io.BufferedIOBase):
+        self.raw = raw
+        self.hasher = hashlib.blake2b(digest_size=16)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self.raw.readinto(buffer)
+        if n:
+            self.hasher.update(memoryview(buffer)[:n])
+        return n
+
+    def finish(self) -> str:
+        """Hash whatever has not been read yet and return the hex digest."""
+        while chunk := self.raw.read(WRAP_CHUNK):
+            self.hasher.update(chunk)
+        return self.hasher.hexdigest()
+
+
+# ── Core Functions ────────────────────────────────────────────────────────────
+class Wrapped(NamedTuple):
+    digest: str  # BLAKE2b of the source bytes ("" if unreadable)
+    sketch: bytes | None  # MinHash sketch to index — None for binaries and near-duplicates
+    attachment: Path | None = None  # where a binary source was moved — returned to /Inbox if its note fails
+
+
+class DuplicateDrop(Exception):
+    """Raised while wrapping when the content was already filed within DEDUP_TTL_DAYS."""
+
+    def __init__(self, digest: str, original: str):
+        super().__init__(f"duplicate of {original}")
+        self.digest = digest
+        self.original = original  # vault path of the existing note
+
+
+def screen_duplicate(source: Path, digest: str) -> None:
+    """Raise DuplicateDrop if this digest was filed recently; otherwise claim it for source.
+
+    The claim lasts until the drop is recorded in the ledger or released.
+    """
+    if DEDUP_TTL_DAYS > 0 and (original := ledger.claim(digest, source.name, DEDUP_TTL_DAYS * 86400)):
+        raise DuplicateDrop(digest, original)
+
+
+def near_duplicate_fields(source: Path, sig: bytes | None) -> dict | None:
+    """Frontmatter linking a drop to the indexed note it nearly duplicates, if any."""
+    if sig is None or near_dups is None or (match := near_dups.find(sig)) is None:
+        return None
+    note, score = match
+    logger.info(f"  ~~ {source.name} resembles /{note} ({score:.0%} similar)")
+    return {"near_duplicate_of": note, "near_duplicate_similarity": f"{score:.2f}"}
+
+
+def envelope_head(source: Path, timestamp: str, preview: str, extra: dict | None = None) -> str:
+    """Frontmatter + preview section, up to where the full content begins."""
+    extra_lines = "".join(f"{key}: {val}\n" for key, val in (extra or {}).items())
     return f"""---
 type: dropped_file
 original: {source.name}
 detected: {timestamp}
 status: pending
----
+{extra_lines}---
 
 # Task: {source.stem}
 
@@ -113,180 +384,640 @@ status: pending
 {preview}
 
 ## Full Content
-{full_content}
+"""
+
+
+def envelope_tail(timestamp: str, entry: str = DETECTED_ENTRY) -> str:
+    """Action Log section that closes the envelope after the full content."""
+    return f"""
 
 ## Action Log
-- [{timestamp}] Detected in /Inbox by Watcher, processed to /Needs_Action
+- [{timestamp}] {entry}
 """
 
 
-def scan_inbox() -> list[Path]:
-    """Return new (unprocessed) files in /Inbox, ignoring system files."""
-    skip = {".DS_Store", ".gitkeep", "desktop.ini", "Thumbs.db"}
-    new_files = []
-    try:
-        for item in INBOX.iterdir():
-            if item.is_file() and item.name not in processed_files and item.name not in skip:
-                new_files.append(item)
-    except PermissionError:
-        logger.error(f"Permission denied scanning: {INBOX}")
-    except FileNotFoundError:
-        logger.error(f"Inbox folder missing: {INBOX}")
-    return new_files
+def make_preview(head: str) -> str:
+    preview = head[:PREVIEW_CHARS]
+    if len(head) > PREVIEW_CHARS:
+        preview += "\n... (truncated)"
+    return preview
+
 
+def is_binary(source: Path) -> bool:
+    """Sniff the first SNIFF_BYTES — NUL bytes or invalid UTF-8 mean binary."""
+    try:
+        with source.open("rb") as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return False  # let the text path report the read error
+    if b"\0" in head:
+        return True
+    try:
+        # final=False tolerates a multi-byte character cut off at the sniff boundary
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
 
-def process_file(source: Path) -> None:
-    """Wrap file with metadata → /Needs_Action, delete from Inbox."""
-    dest_name = f"{source.stem}_processed.md"
-    dest = NEEDS_ACTION / dest_name
 
-    # Avoid overwriting
+def claim_attachment(name: str) -> Path:
+    """Reserve a free /Attachments name with O_EXCL; the move replaces the placeholder."""
+    original = ATTACHMENTS / name
+    dest = original
     counter = 1
-    while dest.exists():
-        dest = NEEDS_ACTION / f"{source.stem}_processed_{counter}.md"
-        counter += 1
+    while True:
+        try:
+            with dest.open("xb"):
+                return dest
+        except FileExistsError:
+            dest = ATTACHMENTS / f"{original.stem}_{counter}{original.suffix}"
+            counter += 1
+
+
+def move_zero_copy(source: Path, dest: Path) -> None:
+    """Move source onto dest without pulling its bytes through user space.
 
+    Same filesystem: a metadata-only rename. Across filesystems: in-kernel
+    copy_file_range (a plain chunked copy where that is unsupported), then the
+    source is removed.
+    """
     try:
-        wrapped = wrap_with_metadata(source)
-        dest.write_text(wrapped, encoding="utf-8")
-        logger.info(f"  >> {source.name} --> /Needs_Action/{dest.name}")
-    except PermissionError:
-        logger.error(f"Cannot write to {dest} — permission denied")
+        os.replace(source, dest)
         return
     except OSError as e:
-        logger.error(f"Failed writing {dest}: {e}")
+        if e.errno != errno.EXDEV:
+            raise
+
+    with source.open("rb") as fin, dest.open("wb") as fout:
+        remaining = os.fstat(fin.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fin.fileno(), fout.fileno(), min(remaining, 1 << 30))
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            fout.seek(0)
+            fout.truncate()
+            fin.seek(0)
+            remaining = 0
+            shutil.copyfileobj(fin, fout, WRAP_CHUNK)
+    source.unlink()
+
+
+def hash_file(path: Path) -> tuple[int, str]:
+    """Return (size, BLAKE2b hex digest), reading into one reused buffer."""
+    hasher = hashlib.blake2b(digest_size=16)
+    buf = bytearray(WRAP_CHUNK)
+    view = memoryview(buf)
+    size = 0
+    with path.open("rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+            size += n
+    return size, hasher.hexdigest()
+
+
+def store_attachment(source: Path, out: TextIO, entry: str = DETECTED_ENTRY) -> Wrapped:
+    """Move a binary drop into /Attachments and write a note into out that links to it.
+
+    Hashed before the move, so a duplicate is never stored twice. Until the
+    note is filed the caller owns the move: on failure it calls
+    restore_attachment(), so the source is back in /Inbox for the retry.
+    """
+    size, digest = hash_file(source)
+    screen_duplicate(source, digest)
+
+    timestamp = now_str()
+    dest = claim_attachment(source.name)
+    try:
+        with counters.transition("inbox", -1):
+            move_zero_copy(source, dest)
+    except OSError:
+        dest.unlink(missing_ok=True)
+        raise
+    durable.track_move(dest)
+
+    link = f"Attachments/{dest.name}"
+    summary = f"[Binary attachment: [[{link}]] — {size:,} bytes, blake2b {digest}]"
+
+    try:
+        out.write(envelope_head(source, timestamp, summary, {
+            "attachment": link,
+            "size": size,
+            "blake2b": digest,
+        }))
+        out.write(summary)
+        out.write(envelope_tail(timestamp, entry))
+    except OSError:
+        restore_attachment(dest, source)
+        raise
+    logger.info(f"  Binary file {source.name} stored as /{link} ({size:,} bytes)")
+    return Wrapped(digest, None, dest)
+
+
+def restore_attachment(attachment: Path, source: Path) -> None:
+    """Move a stored attachment back to /Inbox after its note failed to file."""
+    if source.exists():
+        logger.error(f"Cannot return /Attachments/{attachment.name} to /Inbox — {source.name} was dropped again")
         return
+    try:
+        with counters.transition("inbox", +1):
+            move_zero_copy(attachment, source)
+    except OSError as e:
+        logger.error(f"Cannot return /Attachments/{attachment.name} to /Inbox: {e}")
+
+
+def wrap_with_metadata(source: Path, out: TextIO, entry: str = DETECTED_ENTRY) -> Wrapped:
+    """Stream original content into out, wrapped in the .md metadata envelope.
+
+    Only the first chunk is held for the preview; the rest is copied through
+    in WRAP_CHUNK pieces, so memory stays flat however large the source is.
+    Binary content — sniffed up front, or found late by a decode error — is moved
+    to /Attachments instead (out must be a fresh, seekable file so it can be rewound).
+    Returns the BLAKE2b digest of the source bytes ("" if unreadable), hashed
+    while streaming; raises DuplicateDrop if that content was filed recently.
+    The preview chunk is also sketched for the near-duplicate index, and a match
+    is recorded in the frontmatter as near_duplicate_of. entry opens the action log.
+    """
+    if is_binary(source):
+        return store_attachment(source, out, entry)
+
+    timestamp = now_str()
+
+    try:
+        with source.open("rb") as raw:
+            hashing = HashingReader(raw)
+            src = io.TextIOWrapper(io.BufferedReader(hashing, WRAP_CHUNK), encoding="utf-8")
+            try:
+                head = src.read(WRAP_CHUNK)
+                sig = sketch(head) if near_dups is not None else None
+                extra = near_duplicate_fields(source, sig)
+                out.write(envelope_head(source, timestamp, make_preview(head), extra))
+                out.write(head)
+                while chunk := src.read(WRAP_CHUNK):
+                    out.write(chunk)
+                out.write(envelope_tail(timestamp, entry))
+                digest = hashing.finish()
+                screen_duplicate(source, digest)
+                # A near-duplicate is not indexed itself — later resends link to its original
+                return Wrapped(digest, None if extra else sig)
+            except UnicodeDecodeError:
+                pass
+            finally:
+                src.detach()
+    except PermissionError:
+        logger.error(f"Permission denied reading: {source.name}")
+        placeholder = f"[Permission denied: {source.name}]"
+        out.seek(0)
+        out.truncate()
+        out.write(envelope_head(source, timestamp, make_preview(placeholder)))
+        out.write(placeholder)
+        out.write(envelope_tail(timestamp, entry))
+        return Wrapped("", None)
+
+    # Invalid UTF-8 past the sniff window — treat as binary after all
+    logger.warning(f"Binary content found late in {source.name}, storing as attachment")
+    out.seek(0)
+    out.truncate()
+    return store_attachment(source, out, entry)
+
+
+class InboxScanner:
+    """scandir-based /Inbox scanner that only releases files once they stop changing.
+
+    Skips the listing entirely while the Inbox mtime is unchanged and nothing
+    is settling. A new file is held until its (size, mtime) has been observed
+    unchanged for SETTLE_SECONDS, so half-copied uploads are never wrapped —
+    unless inotify reported it closed after writing or moved in (finished()),
+    which already means it is complete.
+    A file whose ingest failed is handed back with retry() and released again
+    once its retry delay has passed — the unchanged mtime does not hide it.
+    """
+    SKIP = {".DS_Store", ".gitkeep", "desktop.ini", "Thumbs.db"}
+    RACY_NS = 2_000_000_000  # a dir mtime this fresh may hide same-tick changes
+
+    def __init__(self, settle: float, retry_delay: float):
+        self.settle = settle
+        self.retry_delay = retry_delay
+        self.dir_mtime: int | None = None
+        self.settling: dict[str, tuple[int, int, float]] = {}  # name -> (size, mtime_ns, stable since)
+        self.retrying: dict[str, float] = {}  # name -> monotonic time it is released again
+        self.finished_names: set[str] = set()  # reported complete by inotify — no settle wait
+        self.lock = threading.Lock()  # retry() may be called from ingest threads mid-scan
+
+    def retry(self, name: str) -> None:
+        """Hand back a released file whose ingest failed, to be released again later."""
+        with self.lock:
+            self.retrying[name] = time.monotonic() + self.retry_delay
+
+    def finished(self, names) -> None:
+        """Release these files at the next scan without waiting for them to settle."""
+        with self.lock:
+            self.finished_names.update(names)
+            self.dir_mtime = None  # rewritten in place leaves the Inbox mtime alone — list anyway
+
+    def seconds_until_due(self) -> float | None:
+        """Time until the earliest settling or retried file could be released, or None if none are."""
+        with self.lock:
+            due = [since + self.settle for _, _, since in self.settling.values()]
+            due.extend(self.retrying.values())
+        if not due:
+            return None
+        return max(0.0, min(due) - time.monotonic())
+
+    def _retry_due(self, name: str, now: float) -> bool | None:
+        """For a retried file: True once it is due (and no longer retried), False before. None otherwise."""
+        at = self.retrying.get(name)
+        if at is None:
+            return None
+        if at > now:
+            return False
+        del self.retrying[name]
+        return True
+
+    def _is_stable(self, name: str, st: os.stat_result, now: float) -> bool:
+        if self.settle <= 0 or name in self.finished_names:
+            self.finished_names.discard(name)
+            self.settling.pop(name, None)
+            return True
+        seen = self.settling.get(name)
+        if seen and seen[0] == st.st_size and seen[1] == st.st_mtime_ns:
+            if now - seen[2] >= self.settle:
+                del self.settling[name]
+                return True
+            return False
+        self.settling[name] = (st.st_size, st.st_mtime_ns, now)
+        return False
+
+    def scan(self) -> list[Path]:
+        """Return new, fully written files in /Inbox, ignoring system files."""
+        with self.lock:
+            return self._scan()
+
+    def _scan(self) -> list[Path]:
+        try:
+            dir_mtime = os.stat(INBOX).st_mtime_ns
+        except FileNotFoundError:
+            logger.error(f"Inbox folder missing: {INBOX}")
+            return []
+
+        unchanged = dir_mtime == self.dir_mtime and time.time_ns() - dir_mtime > self.RACY_NS
+        if unchanged and not self.settling and not self.retrying:
+            return []
+
+        now = time.monotonic()
+        new_files = []
+        if unchanged:
+            # Nothing added or removed — only re-check files still settling or due a retry
+            for name in list(self.settling):
+                try:
+                    st = os.stat(INBOX / name)
+                except FileNotFoundError:
+                    self.settling.pop(name, None)
+                    continue
+                if self._is_stable(name, st, now):
+                    new_files.append(INBOX / name)
+            for name in [n for n, at in self.retrying.items() if at <= now]:
+                del self.retrying[name]
+                try:
+                    st = os.stat(INBOX / name)
+                except FileNotFoundError:
+                    continue
+                if not ledger.seen(name, st):
+                    new_files.append(INBOX / name)
+            return new_files
+
+        try:
+            file_count = 0
+            present = set()
+            with os.scandir(INBOX) as it:
+                for entry in it:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    file_count += 1
+                    if entry.name in self.SKIP:
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    if ledger.seen(entry.name, st):
+                        continue
+                    present.add(entry.name)
+                    if (due := self._retry_due(entry.name, now)) is not None:
+                        if due:
+                            new_files.append(Path(entry.path))
+                    elif self._is_stable(entry.name, st, now):
+                        new_files.append(Path(entry.path))
+            # Forget files that vanished (or were filed elsewhere) while settling or waiting to retry
+            for name in self.settling.keys() - present:
+                del self.settling[name]
+            for name in self.retrying.keys() - present:
+                del self.retrying[name]
+            self.finished_names &= present
+            self.dir_mtime = dir_mtime
+            # The listing doubles as the Inbox count — no separate recount needed
+            counters.observe("inbox", file_count, dir_mtime)
+        except PermissionError:
+            logger.error(f"Permission denied scanning: {INBOX}")
+        except FileNotFoundError:
+            logger.error(f"Inbox folder missing: {INBOX}")
+        return new_files
+
+
+def action_shard() -> NameAllocator:
+    """Allocator for the folder new notes go to — /Needs_Action, or today's shard of it."""
+    global needs_action_names
+    shard = layout.shard(NEEDS_ACTION)
+    with names_lock:
+        if needs_action_names.folder != shard:
+            shard.mkdir(parents=True, exist_ok=True)
+            needs_action_names = NameAllocator(shard)
+        return needs_action_names
+
+
+def discard_temp(tmp: Path) -> None:
+    """Remove the temp file of a failed wrap."""
+    try:
+        with counters.transition("action", 0):
+            tmp.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 
+def remove_source(source: Path) -> None:
+    """Delete an ingested file from /Inbox (runs once its note is durable)."""
     try:
-        source.unlink()
-        processed_files.add(source.name)
+        with counters.transition("inbox", -1):
+            source.unlink()
+    except FileNotFoundError:
+        pass  # attachments were already moved out
     except PermissionError:
         logger.error(f"Cannot delete source {source.name} — permission denied, file was copied but not removed")
     except OSError as e:
         logger.error(f"Failed deleting {source.name}: {e}")
 
-    # Append activity line to Dashboard
-    append_dashboard_activity(source.name, dest.name)
 
+def locate_note(note: str) -> str:
+    """Where a note filed as `note` is now — the reasoning loop may have archived it since.
 
-def append_dashboard_activity(original: str, dest: str) -> None:
-    """Append a detection line to Dashboard.md Recent Activity section."""
-    dashboard = VAULT_PATH / "Dashboard.md"
-    if not dashboard.exists():
-        logger.warning("Dashboard.md not found, skipping activity append")
-        return
+    A note a human moved into /Approved keeps its name, so that move is followed too.
+    """
+    current = note_moves.resolve(note)
+    if current == note and not (VAULT_PATH / note).exists():
+        approved = note_moves.resolve(f"Approved/{PurePosixPath(note).name}")
+        if (VAULT_PATH / approved).exists():
+            return approved
+    return current
 
-    try:
-        content = dashboard.read_text(encoding="utf-8")
-        timestamp = now_short()
-        new_line = f"| {timestamp} | 📥 Watcher Detect | `{original}` → `/Needs_Action/{dest}` |"
-
-        # Insert after the Recent Activity table header row
-        marker = "| Time | Action | Details |"
-        divider = "|------|--------|---------|"
-
-        if marker in content and divider in content:
-            content = content.replace(
-                divider,
-                f"{divider}\n{new_line}",
-                1
-            )
-        else:
-            # Fallback: append to end of file
-            content += f"\n- [{timestamp}] New file detected: {original} → Needs_Action/{dest}\n"
 
-        dashboard.write_text(content, encoding="utf-8")
-        logger.info(f"  Dashboard activity appended for {original}")
-    except Exception as e:
-        logger.error(f"Failed updating Dashboard.md: {e}")
+def skip_duplicate(source: Path, st: os.stat_result, dup: DuplicateDrop) -> str:
+    """Link a duplicate drop to its existing note and drop it from /Inbox after the commit.
 
+    Returns the note's current vault path — also what the ledger records, so
+    later duplicates link there directly.
+    """
+    original = locate_note(dup.original)
+    logger.info(f"  == {source.name} duplicates /{original} — linked, not re-ingested")
+    ledger.record(source.name, st, dup.digest, original)
+    durable.after_commit(lambda: remove_source(source))
+    return original
 
-def update_dashboard_counts() -> None:
-    """Recount files in each folder and update Dashboard.md stats."""
-    dashboard = VAULT_PATH / "Dashboard.md"
-    if not dashboard.exists():
-        logger.warning("Dashboard.md not found, skipping count update")
-        return
 
+def process_file(source: Path) -> tuple[str, str, bool] | None:
+    """Wrap file with metadata → /Needs_Action, delete from Inbox.
+
+    The note is written to a temp file and linked into place under a free name;
+    the source is only deleted after the cycle's group commit.
+    Returns (original name, destination, is duplicate) for the Dashboard, or None
+    on failure — a duplicate's destination is the vault path of the existing note.
+    """
     try:
-        inbox_count = sum(1 for f in INBOX.iterdir() if f.is_file())
-        action_count = sum(1 for f in NEEDS_ACTION.iterdir() if f.is_file())
-        done_count = sum(1 for f in DONE.iterdir() if f.is_file())
+        st = source.stat()
+        names = action_shard()
+        with counters.transition("action", 0):
+            tmp, out = durable.open_temp(names.folder)
     except OSError as e:
-        logger.error(f"Error counting folder contents: {e}")
-        return
+        logger.error(f"Cannot create note for {source.name} in /Needs_Action: {e}")
+        return None
 
+    wrapped = None
     try:
-        content = dashboard.read_text(encoding="utf-8")
-        timestamp = now_str()
-
-        # Update status table
-        content = re.sub(r"(🕐 Last updated \| ).+", f"\\g<1>{timestamp} |", content)
-        content = re.sub(r"(📥 Inbox items \| )\d+", f"\\g<1>{inbox_count}", content)
-        content = re.sub(r"(⚡ Needs_Action items \| )\d+", f"\\g<1>{action_count}", content)
-        content = re.sub(r"(✅ Done items \| )\d+", f"\\g<1>{done_count}", content)
-
-        # Update folder overview table
-        content = re.sub(r"(📥 `/Inbox` \| )\d+", f"\\g<1>{inbox_count}", content)
-        content = re.sub(r"(⚡ `/Needs_Action` \| )\d+", f"\\g<1>{action_count}", content)
-        content = re.sub(r"(✅ `/Done` \| )\d+", f"\\g<1>{done_count}", content)
-
-        dashboard.write_text(content, encoding="utf-8")
-        logger.info(f"  Counts updated: Inbox={inbox_count} | Action={action_count} | Done={done_count}")
-    except Exception as e:
-        logger.error(f"Failed updating Dashboard counts: {e}")
+        with out:
+            wrapped = wrap_with_metadata(source, out)
+        with counters.transition("action", +1):
+            dest = names.publish(tmp, f"{source.stem}_processed", durable)
+        rel = dest.relative_to(NEEDS_ACTION).as_posix()
+        logger.info(f"  >> {source.name} --> /Needs_Action/{rel}")
+    except DuplicateDrop as dup:
+        discard_temp(tmp)
+        return source.name, skip_duplicate(source, st, dup), True
+    except OSError as e:
+        if isinstance(e, PermissionError):
+            logger.error(f"Cannot write note for {source.name} — permission denied")
+        else:
+            logger.error(f"Failed writing note for {source.name}: {e}")
+        discard_temp(tmp)
+        if wrapped is not None and wrapped.attachment is not None:
+            restore_attachment(wrapped.attachment, source)
+        ledger.release(source.name)
+        return None
+
+    # Record before unlinking — a source that cannot be removed is not re-ingested
+    ledger.record(source.name, st, wrapped.digest, f"Needs_Action/{rel}")
+    if wrapped.sketch is not None:
+        near_dups.add(wrapped.sketch, f"Needs_Action/{rel}")
+    durable.after_commit(lambda: remove_source(source))
+
+    return source.name, rel, False
+
+
+def ingest_batch(files: list[Path]) -> list[tuple[str, str, bool]]:
+    """Process one cycle's files — across a thread pool when WORKERS > 1.
+
+    Results keep name order so Dashboard rows match the sequential path.
+    """
+    ordered = sorted(files, key=lambda p: p.name)
+    if WORKERS <= 1 or len(ordered) <= 1:
+        results = [process_file(f) for f in ordered]
+    else:
+        with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="ingest") as pool:
+            results = list(pool.map(process_file, ordered))
+    for source, result in zip(ordered, results):
+        if result is None:
+            inbox_scanner.retry(source.name)
+    return [r for r in results if r]
+
+
+def append_dashboard_activity(entries: list[tuple[str, str, bool]]) -> None:
+    """Queue detection lines for the Dashboard.md Recent Activity section."""
+    if not entries:
+        return
+
+    timestamp = now_short()
+    # Newest first, as if each row had been inserted under the divider in turn.
+    # Duplicates link by vault path — under a sharded layout names repeat across days.
+    rows = [
+        f"| {timestamp} | ♻️ Duplicate Drop | `{original}` = [[{dest.removesuffix('.md')}]] — not re-ingested |"
+        if duplicate else
+        f"| {timestamp} | 📥 Watcher Detect | `{original}` → `/Needs_Action/{dest}` |"
+        for original, dest, duplicate in reversed(entries)
+    ]
+    fallback = [
+        f"- [{timestamp}] Duplicate drop: {original} = {dest}"
+        if duplicate else
+        f"- [{timestamp}] New file detected: {original} → Needs_Action/{dest}"
+        for original, dest, duplicate in entries
+    ]
+    dashboard.add_activity(rows, fallback)
+
+
+def update_dashboard_counts() -> None:
+    """Queue current folder counts for Dashboard.md — O(1) unless a folder changed externally."""
+    dashboard.set_counts(counters.current())
+    counters.save()
 
 
 # ── Main Loop ─────────────────────────────────────────────────────────────────
-def print_banner() -> None:
+def print_banner(watch: InotifyWatch | None) -> None:
     logger.info("=" * 55)
     logger.info("  BRONZE TIER - FILESYSTEM WATCHER v3.0")
     logger.info("=" * 55)
     logger.info(f"  Vault:    {VAULT_PATH}")
     logger.info(f"  Monitor:  {INBOX}")
     logger.info(f"  Target:   {NEEDS_ACTION}")
+    logger.info(f"  Layout:   {layout.layout}")
     logger.info(f"  Log file: {LOG_FILE}")
-    logger.info(f"  Interval: {POLL_INTERVAL}s")
+    if watch:
+        logger.info("  Mode:     inotify (event-driven)")
+    else:
+        logger.info(f"  Mode:     adaptive polling {POLL_INTERVAL}s → {POLL_MAX_INTERVAL}s idle cap")
+    logger.info(f"  Settle:   {SETTLE_SECONDS}s")
+    logger.info(f"  Workers:  {WORKERS}")
+    logger.info(f"  Ledger:   {len(ledger.entries)} entries (max {LEDGER_MAX_ENTRIES}, {LEDGER_TTL_DAYS}d TTL)")
+    logger.info("  Dedup:    " + (f"exact re-drops within {DEDUP_TTL_DAYS}d" if DEDUP_TTL_DAYS > 0 else "off"))
+    if near_dups is not None:
+        logger.info(f"  Near-dup: ≥ {NEAR_DUP_THRESHOLD:.0%} similar ({near_dups.bands} LSH bands), "
+                    f"{len(near_dups.entries)} notes indexed (max {NEAR_DUP_MAX_ENTRIES}, {NEAR_DUP_TTL_DAYS}d TTL)")
+    else:
+        logger.info("  Near-dup: off")
     logger.info("=" * 55)
     logger.info("  Drop any file in /Inbox — watcher will pick it up!")
     logger.warning("  Press Ctrl+C to stop")
     logger.info("=" * 55)
 
 
-def run_watcher() -> None:
-    """Main polling loop with full error handling."""
-    print_banner()
+def take_finished(watch: InotifyWatch) -> None:
+    """Hand the files inotify saw finish (closed after writing, or moved in) to the scanner."""
+    if changed := watch.take_changes():
+        inbox_scanner.finished(path.name for path in changed)
+
+
+def wait_for_inbox(watch: InotifyWatch | None) -> InotifyWatch | None:
+    """Block until the next cycle should run. Returns the (possibly dropped) watch."""
+    wake_in = [t for t in (dashboard.seconds_until_due(), inbox_scanner.seconds_until_due()) if t is not None]
 
+    if watch is None:
+        time.sleep(min([poller.interval, *wake_in]))
+        return None
+
+    if watch.wait(min([EVENT_RESCAN, *wake_in])):
+        take_finished(watch)
+    if not watch.alive:
+        # /Inbox was deleted or moved — recreate it and re-arm the watch
+        watch.close()
+        logger.warning("Inbox watch lost — re-creating /Inbox and re-arming")
+        try:
+            INBOX.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Cannot re-create {INBOX}: {e}")
+        return open_inbox_watch()
+    return watch
+
+
+def open_vault() -> None:
+    """Create the vault folders and load the watcher's state (ledger, counters, writers)."""
     # Ensure all folders exist
-    for folder in [INBOX, NEEDS_ACTION, DONE, LOGS]:
+    for folder in [INBOX, NEEDS_ACTION, DONE, ATTACHMENTS, LOGS]:
         try:
             folder.mkdir(parents=True, exist_ok=True)
         except OSError as e:
             logger.critical(f"Cannot create folder {folder}: {e}")
             sys.exit(1)
 
+    global ledger, near_dups, note_moves, layout, needs_action_names, dashboard, counters, durable, inbox_scanner, poller
+    layout = VaultLayout(VAULT_PATH)
+    poller = AdaptivePoller(POLL_INTERVAL, POLL_MAX_INTERVAL)
+    inbox_scanner = InboxScanner(SETTLE_SECONDS, RETRY_SECONDS)
+    durable = DurableWriter(DURABILITY)
+    for folder in [VAULT_PATH, *layout.shards(NEEDS_ACTION)]:
+        if removed := DurableWriter.sweep_temps(folder):
+            logger.warning(f"Removed {removed} stale temp file(s) from {folder}")
+    dashboard = DashboardWriter(VAULT_PATH / "Dashboard.md", logger, durable, DASHBOARD_DEBOUNCE)
+    counters = FolderCounters(
+        STATE / "counters.json", {"inbox": INBOX, "action": NEEDS_ACTION, "done": DONE},
+        layout, sharded=("action", "done")
+    )
+    try:
+        ledger = IngestLedger(STATE / "ingest_ledger.jsonl", LEDGER_MAX_ENTRIES, LEDGER_TTL_DAYS * 86400)
+        note_moves = NoteMoves(STATE / "note_moves.jsonl", LEDGER_TTL_DAYS * 86400)
+        if NEAR_DUP_THRESHOLD > 0:
+            near_dups = NearDuplicateIndex(STATE / "near_duplicates.jsonl", NEAR_DUP_THRESHOLD,
+                                           NEAR_DUP_MAX_ENTRIES, NEAR_DUP_TTL_DAYS * 86400)
+        shard = layout.shard(NEEDS_ACTION)
+        shard.mkdir(parents=True, exist_ok=True)
+        needs_action_names = NameAllocator(shard)
+    except OSError as e:
+        logger.critical(f"Cannot load vault state: {e}")
+        sys.exit(1)
+
+
+def run_watcher() -> None:
+    """Main watch loop with full error handling."""
+    open_vault()
+
+    watch = open_inbox_watch()
+    print_banner(watch)
+
     cycle = 0
     while True:
         try:
             cycle += 1
-            new_files = scan_inbox()
+            new_files = inbox_scanner.scan()
 
             if new_files:
                 logger.info(f"[Cycle {cycle}] Found {len(new_files)} new file(s)!")
-                for f in sorted(new_files, key=lambda p: p.name):
-                    process_file(f)
+                append_dashboard_activity(ingest_batch(new_files))
+                durable.commit()  # one group fsync, then Inbox sources are removed
+                ledger.flush()
+                if near_dups is not None:
+                    near_dups.flush()
                 update_dashboard_counts()
+            elif inbox_scanner.settling:
+                logger.debug(f"[Cycle {cycle}] {len(inbox_scanner.settling)} file(s) still being written, waiting to settle...")
             else:
-                if cycle % 6 == 0:
+                if watch or cycle % 6 == 0:
                     logger.debug(f"[Cycle {cycle}] Inbox empty, watching...")
 
+            if dashboard.flush() or durable.has_pending():  # or retry a commit that failed
+                durable.commit()
+
+            if not watch:
+                previous = poller.interval
+                poller.record(len(new_files), len(inbox_scanner.settling))
+                if poller.interval != previous:
+                    logger.debug(f"[Cycle {cycle}] Poll interval {previous:g}s → {poller.interval:g}s | queue depth {poller.queue_depth}")
+            watch = wait_for_inbox(watch)
+
         except KeyboardInterrupt:
+            dashboard.flush(force=True)
+            durable.commit()
             logger.warning("Watcher stopped by user (Ctrl+C)")
             sys.exit(0)
         except Exception as e:
             logger.error(f"Unexpected error in cycle {cycle}: {e}", exc_info=True)
-
-        time.sleep(POLL_INTERVAL)
+            time.sleep(POLL_INTERVAL)
 
 
 def parse_args():
@@ -299,9 +1030,60 @@ def parse_args():
     )
     parser.add_argument(
         "--interval", type=int, default=POLL_INTERVAL,
-        help=f"Poll interval in seconds (default: {POLL_INTERVAL})"
+        help=f"Base poll interval in seconds (default: {POLL_INTERVAL})"
+    )
+    parser.add_argument(
+        "--max-interval", type=int, default=POLL_MAX_INTERVAL,
+        help=f"Idle back-off cap for the poll interval in seconds (default: {POLL_MAX_INTERVAL})"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=SETTLE_SECONDS,
+        help=f"Seconds a file's size and mtime must hold steady before ingest, 0 to disable; files inotify reports finished skip it (default: {SETTLE_SECONDS})"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=WORKERS,
+        help=f"Ingest threads per cycle — >1 wraps and moves files concurrently (default: {WORKERS})"
+    )
+    parser.add_argument(
+        "--durability", choices=DURABILITY_LEVELS, default=DURABILITY,
+        help="fsync policy: none, batch (group commit per cycle), always (default: batch)"
+    )
+    parser.add_argument(
+        "--dashboard-debounce", type=float, default=DASHBOARD_DEBOUNCE,
+        help=f"Seconds to coalesce Dashboard.md updates before one rewrite (default: {DASHBOARD_DEBOUNCE})"
+    )
+    parser.add_argument(
+        "--ledger-max", type=int, default=LEDGER_MAX_ENTRIES,
+        help=f"Max entries kept in the processed-file ledger (default: {LEDGER_MAX_ENTRIES})"
+    )
+    parser.add_argument(
+        "--ledger-ttl-days", type=int, default=LEDGER_TTL_DAYS,
+        help=f"Days before a ledger entry expires (default: {LEDGER_TTL_DAYS})"
+    )
+    parser.add_argument(
+        "--dedup-ttl-days", type=float, default=DEDUP_TTL_DAYS,
+        help=f"Days identical content counts as a duplicate of its first note, 0 to disable (default: {DEDUP_TTL_DAYS})"
+    )
+    parser.add_argument(
+        "--near-dup-threshold", type=float, default=NEAR_DUP_THRESHOLD,
+        help=f"Similarity (0-1) at which a drop is marked near_duplicate_of an earlier note, 0 to disable (default: {NEAR_DUP_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--near-dup-max", type=int, default=NEAR_DUP_MAX_ENTRIES,
+        help=f"Max notes kept in the near-duplicate index, ~2 KB of memory each (default: {NEAR_DUP_MAX_ENTRIES})"
+    )
+    parser.add_argument(
+        "--near-dup-ttl-days", type=int, default=NEAR_DUP_TTL_DAYS,
+        help=f"Days a note stays in the near-duplicate index without a match (default: {NEAR_DUP_TTL_DAYS})"
+    )
+    parser.add_argument(
+        "--backend", choices=["auto", "inotify", "poll"], default=WATCH_BACKEND,
+        help="Inbox watch backend: inotify (Linux, event-driven), poll, or auto (default: auto)"
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not 0 <= args.near_dup_threshold <= 1:
+        parser.error("--near-dup-threshold must be between 0 and 1")
+    return args
 
 
 if __name__ == "__main__":
@@ -311,9 +1093,23 @@ if __name__ == "__main__":
     INBOX = VAULT_PATH / "Inbox"
     NEEDS_ACTION = VAULT_PATH / "Needs_Action"
     DONE = VAULT_PATH / "Done"
+    ATTACHMENTS = VAULT_PATH / "Attachments"
     LOGS = VAULT_PATH / "Logs"
     LOG_FILE = LOGS / "watcher.log"
+    STATE = VAULT_PATH / ".state"
     POLL_INTERVAL = args.interval
+    POLL_MAX_INTERVAL = args.max_interval
+    WATCH_BACKEND = args.backend
+    SETTLE_SECONDS = args.settle
+    WORKERS = max(1, args.workers)
+    DURABILITY = args.durability
+    DASHBOARD_DEBOUNCE = args.dashboard_debounce
+    LEDGER_MAX_ENTRIES = args.ledger_max
+    LEDGER_TTL_DAYS = args.ledger_ttl_days
+    DEDUP_TTL_DAYS = args.dedup_ttl_days
+    NEAR_DUP_THRESHOLD = args.near_dup_threshold
+    NEAR_DUP_MAX_ENTRIES = args.near_dup_max
+    NEAR_DUP_TTL_DAYS = args.near_dup_ttl_days
 
     setup_logging()
     run_watcher()
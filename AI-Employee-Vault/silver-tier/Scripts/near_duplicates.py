@@ -0,0 +1,250 @@
+"""
+Near-duplicate detection for Inbox drops: MinHash sketches + LSH banding.
+Catches resends that differ only by a date, a time, a signature or whitespace —
+which exact content hashes miss.
+
+  - sketch()            — one-permutation MinHash over word 3-shingles: each
+                          shingle is hashed once (BLAKE2b) into one of 64 bins,
+                          and each bin keeps its minimum
+  - figures()           — the numbers a match must agree on before it is trusted
+  - NearDuplicateIndex  — sketches split into bands; a new sketch only meets
+                          the notes sharing at least one whole band, so lookup
+                          is a few dict probes however many notes are indexed
+
+The index persists in /.state as an append-only JSON-lines log (like the
+ingest ledger), with LRU/TTL eviction and periodic compaction.
+"""
+
+from array import array
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+SHINGLE_WORDS = 3
+NUM_BINS = 64
+MIN_SHINGLES = 8  # shorter texts are too small to call near-duplicates
+EMPTY = 0xFFFFFFFF  # bin no shingle landed in
+WORD_RE = re.compile(r"\w+")
+# Dates and times only — invoice numbers, references and amounts are kept
+DATETIME_RE = re.compile(
+    r"\b\d{4}-\d{1,2}-\d{1,2}(?:[T ]\d{1,2}:\d{2}(?::\d{2})?)?\b"
+    r"|\b\d{1,2}[/.]\d{1,2}[/.]\d{2,4}\b"
+    r"|\b\d{1,2}:\d{2}(?::\d{2})?(?:\s*[ap]m)?\b",
+    re.IGNORECASE,
+)
+NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def sketch(text: str) -> bytes | None:
+    """MinHash signature of text (NUM_BINS uint32 values), or None if it is too short.
+
+    Dates and times count as one symbol, so a resend stamped a day later does
+    not look new. Other numbers are kept: a different invoice number or amount
+    lowers the score, and figures() compares them exactly.
+    """
+    words = WORD_RE.findall(DATETIME_RE.sub(" 0 ", text.lower()))
+    count = len(words) - SHINGLE_WORDS + 1
+    if count < MIN_SHINGLES:
+        return None
+    bins = array("I", [EMPTY]) * NUM_BINS
+    blake2b = hashlib.blake2b
+    for i in range(count):
+        shingle = " ".join(words[i:i + SHINGLE_WORDS]).encode()
+        h = int.from_bytes(blake2b(shingle, digest_size=8).digest(), "little")
+        b = h % NUM_BINS
+        value = min(h >> 32, EMPTY - 1)
+        if value < bins[b]:
+            bins[b] = value
+    return bins.tobytes()
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two sketches (bins empty in both are skipped)."""
+    equal = compared = 0
+    for x, y in zip(array("I", a), array("I", b)):
+        if x == EMPTY and y == EMPTY:
+            continue
+        compared += 1
+        if x == y:
+            equal += 1
+    return equal / compared if compared else 0.0
+
+
+def figures(text: str) -> list[str]:
+    """Every number in text apart from dates and times (IDs, references, amounts), sorted."""
+    return sorted(NUMBER_RE.findall(DATETIME_RE.sub(" ", text)))
+
+
+def band_layout(threshold: float) -> tuple[int, int]:
+    """(bands, rows) for a similarity threshold — the longest bands that still
+    make a pair at the threshold a candidate with ≥ 95% probability."""
+    for rows in (32, 16, 8, 4, 2, 1):
+        bands = NUM_BINS // rows
+        if 1 - (1 - threshold ** rows) ** bands >= 0.95:
+            return bands, rows
+    return NUM_BINS, 1
+
+
+class NearDuplicateIndex:
+    """LSH index from sketch to the note it was filed as.
+
+    find() probes one dict per band and verifies each candidate against its
+    stored sketch, so a lookup costs microseconds even with hundreds of
+    thousands of notes indexed. Bands that are entirely empty (short texts)
+    are never indexed, so short notes do not all collide. Entries expire after
+    ttl_seconds or once max_entries is exceeded (least recently matched first).
+    """
+
+    def __init__(self, path: Path, threshold: float, max_entries: int, ttl_seconds: float):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.bands, rows = band_layout(threshold)
+        self.band_bytes = rows * 4
+        self.entries: dict[int, tuple[bytes, str, float]] = {}  # id -> (sketch, note, ts)
+        self.by_note: dict[str, int] = {}
+        self.tables: list[dict[int, int | list[int]]] = [{} for _ in range(self.bands)]
+        self.next_id = 0
+        self.log_lines = 0
+        self.lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._evict(time.time())
+        if self.log_lines > 2 * len(self.entries):
+            self._compact()
+        self._log = self.path.open("a", encoding="utf-8")
+
+    # ── persistence ──
+    def _load(self) -> None:
+        try:
+            f = self.path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                self.log_lines += 1
+                try:
+                    ts, note, hex_sketch = json.loads(line)
+                    sig = bytes.fromhex(hex_sketch)
+                except ValueError:
+                    continue  # torn trailing line from a crash — ignore
+                if len(sig) == NUM_BINS * 4:
+                    self._put(sig, note, ts)
+
+    def _compact(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for sig, note, ts in self.entries.values():
+                f.write(json.dumps([ts, note, sig.hex()]) + "\n")
+        os.replace(tmp, self.path)
+        self.log_lines = len(self.entries)
+
+    def flush(self) -> None:
+        """Persist appended records; compact the log if it has grown stale."""
+        with self.lock:
+            self._log.flush()
+            if self.log_lines > 2 * max(len(self.entries), 1024):
+                self._log.close()
+                self._compact()
+                self._log = self.path.open("a", encoding="utf-8")
+
+    # ── band tables ──
+    def _band_keys(self, sig: bytes):
+        empty = b"\xff" * self.band_bytes
+        for band in range(self.bands):
+            chunk = sig[band * self.band_bytes:(band + 1) * self.band_bytes]
+            if chunk != empty:
+                yield band, hash(chunk)
+
+    def _put(self, sig: bytes, note: str, ts: float) -> None:
+        if (old := self.by_note.get(note)) is not None:
+            self._remove(old)
+        entry_id = self.next_id
+        self.next_id += 1
+        self.entries[entry_id] = (sig, note, ts)
+        self.by_note[note] = entry_id
+        for band, key in self._band_keys(sig):
+            table = self.tables[band]
+            held = table.get(key)
+            if held is None:
+                table[key] = entry_id
+            elif isinstance(held, list):
+                held.append(entry_id)
+            else:
+                table[key] = [held, entry_id]
+
+    def _remove(self, entry_id: int) -> None:
+        sig, note, _ = self.entries.pop(entry_id)
+        if self.by_note.get(note) == entry_id:
+            del self.by_note[note]
+        for band, key in self._band_keys(sig):
+            table = self.tables[band]
+            held = table.get(key)
+            if held == entry_id:
+                del table[key]
+            elif isinstance(held, list):
+                held.remove(entry_id)
+                if len(held) == 1:
+                    table[key] = held[0]
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.ttl_seconds
+        while self.entries:
+            oldest = next(iter(self.entries))
+            if len(self.entries) <= self.max_entries and self.entries[oldest][2] >= cutoff:
+                break
+            self._remove(oldest)
+
+    # ── lookup ──
+    def find(self, sig: bytes) -> tuple[str, float] | None:
+        """The most similar indexed note at or above the threshold, as (note, similarity).
+
+        A match counts as a use: the note moves to the young end of the LRU.
+        """
+        with self.lock:
+            candidates: set[int] = set()
+            for band, key in self._band_keys(sig):
+                held = self.tables[band].get(key)
+                if held is None:
+                    continue
+                if isinstance(held, list):
+                    candidates.update(held)
+                else:
+                    candidates.add(held)
+
+            best, best_score = None, self.threshold
+            for entry_id in candidates:
+                score = similarity(sig, self.entries[entry_id][0])
+                if score >= best_score:
+                    best, best_score = entry_id, score
+            if best is None:
+                return None
+
+            self._touch(best)
+            return self.entries[best][1], best_score
+
+    def add(self, sig: bytes, note: str) -> None:
+        """Index the sketch of a newly filed note (note is its vault path)."""
+        with self.lock:
+            self._record(sig, note)
+
+    def _touch(self, entry_id: int) -> None:
+        """Move an entry to the young end (same sketch, so the band tables are unchanged)."""
+        now = time.time()
+        sig, note, _ = self.entries.pop(entry_id)
+        self.entries[entry_id] = (sig, note, now)
+        self._log.write(json.dumps([now, note, sig.hex()]) + "\n")
+        self.log_lines += 1
+
+    def _record(self, sig: bytes, note: str) -> None:
+        now = time.time()
+        self._put(sig, note, now)
+        self._log.write(json.dumps([now, note, sig.hex()]) + "\n")
+        self.log_lines += 1
+        self._evict(now)
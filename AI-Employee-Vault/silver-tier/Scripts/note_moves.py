@@ -0,0 +1,103 @@
+"""
+Where archived notes went.
+The reasoning loop moves finished notes out of /Needs_Action and /Approved into
+/Done — into a date shard, sometimes under a `_N` name — while the watcher's
+ingest ledger still knows each note by the path it was filed under. NoteMoves
+keeps those moves in /.state as an append-only JSON-lines log (like the ledger),
+so a link to a filed path can follow the note to where it is now.
+"""
+
+from pathlib import Path
+import json
+import os
+import time
+
+
+class NoteMoves:
+    """Note moves (old vault path → new vault path), shared between processes.
+
+    The reasoning loop stages moves with record() and appends them in flush();
+    the watcher calls resolve(), which first reads whatever was appended since
+    its last look — one stat while nothing changed. Moves expire after
+    ttl_seconds and are dropped when the writer compacts the log; a reader
+    notices the replaced file and re-reads it from the start.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.moves: dict[str, tuple[str, float]] = {}  # old -> (new, ts)
+        self.staged: list[str] = []  # log lines not yet appended
+        self.inode: int | None = None
+        self.offset = 0  # bytes of the log already read
+        self.log_lines = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Read moves appended since the last call — by this process or another."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # First read, or the log was compacted since
+            self.moves.clear()
+            self.inode, self.offset, self.log_lines = st.st_ino, 0, 0
+        if st.st_size == self.offset:
+            return
+        try:
+            with self.path.open("rb") as f:
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1  # a line still being appended is read next time
+        for line in data[:end].splitlines():
+            self.log_lines += 1
+            try:
+                ts, old, new = json.loads(line)
+            except ValueError:
+                continue  # torn line from a crash — ignore
+            self.moves[old] = (new, ts)
+        self.offset += end
+
+    def record(self, old: str, new: str) -> None:
+        """Stage a move; it is appended to the log by the next flush()."""
+        now = time.time()
+        self.moves[old] = (new, now)
+        self.staged.append(json.dumps([now, old, new], ensure_ascii=False) + "\n")
+
+    def resolve(self, note: str) -> str:
+        """The vault path a note filed as `note` has now (note itself if it never moved)."""
+        self.refresh()
+        seen = set()
+        while (move := self.moves.get(note)) is not None and note not in seen:
+            seen.add(note)
+            note = move[0]
+        return note
+
+    def flush(self) -> None:
+        """Append staged moves in one write; compact the log once most of it has expired."""
+        if not self.staged:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("".join(self.staged))
+            self.staged.clear()
+            self.refresh()
+            cutoff = time.time() - self.ttl_seconds
+            live = {old: move for old, move in self.moves.items() if move[1] >= cutoff}
+            if self.log_lines > 2 * max(len(live), 1024):
+                self._compact(live)
+        except OSError:
+            pass  # staged moves are retried on the next flush
+
+    def _compact(self, live: dict[str, tuple[str, float]]) -> None:
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for old, (new, ts) in live.items():
+                f.write(json.dumps([ts, old, new], ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        self.inode = None  # re-read the compacted log
+        self.refresh()
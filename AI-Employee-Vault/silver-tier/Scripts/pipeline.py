@@ -0,0 +1,435 @@
+"""
+Bronze Tier - Unified Pipeline v1.0
+Watcher and reasoning loop in one process, as four asyncio stages joined by
+bounded queues:
+  watch   — scan /Inbox (inotify, or adaptive polling) and release settled files
+  wrap    — wrap each file in its metadata envelope, in memory
+  reason  — check the note against the handbook's Approval Rules
+  archive — auto-completed notes go straight to /Done; only notes that need
+            approval are written to /Needs_Action. Inbox sources are removed
+            after each group commit.
+A full queue blocks the stage feeding it, so a burst of drops never runs
+further ahead of the disk than QUEUE_DEPTH notes per stage — and never holds
+more than QUEUE_BYTES of drops in memory. A drop over LARGE_DROP_BYTES is not
+held at all: it is streamed to /Needs_Action as the watcher would file it, and
+left for the reasoning loop.
+"""
+
+from pathlib import Path
+from typing import NamedTuple
+import argparse
+import asyncio
+import io
+import logging
+import os
+import signal
+import threading
+import time
+
+import filesystem_watcher as watcher
+import reasoning_loop as reasoning
+from vault_io import DURABILITY_LEVELS
+from vault_watch import InotifyWatch
+
+# ── Config ────────────────────────────────────────────────────────────────────
+DEFAULT_VAULT = watcher.DEFAULT_VAULT
+QUEUE_DEPTH = 64  # notes buffered between two stages before the upstream stage waits
+QUEUE_BYTES = 64 * 1024 * 1024  # drop bytes held in memory across all stages
+LARGE_DROP_BYTES = 4 * 1024 * 1024  # bigger drops are streamed to /Needs_Action instead
+DETECTED_ENTRY = "Detected in /Inbox by the pipeline"  # first action-log entry — /Done or /Needs_Action is decided later
+PIPELINE_ENTRY = "Filed directly to /Done by the pipeline"
+
+logger = logging.getLogger("pipeline")
+stopping = threading.Event()  # set by SIGTERM / Ctrl+C
+in_flight: set[str] = set()  # Inbox names between watch and archive — never queued twice
+
+
+class Drop(NamedTuple):
+    source: Path
+    st: os.stat_result
+    note: str | None  # the wrapped note, as the watcher would have written it — None once streamed
+    digest: str
+    sketch: bytes | None  # for the near-duplicate index, once the note is filed
+    cost: int  # bytes held against the byte budget until archived
+    filed: tuple[str, str, bool] | None = None  # the watcher's result for a streamed drop
+    attachment: Path | None = None  # a binary drop's stored file — returned to /Inbox if filing fails
+
+
+class ByteBudget:
+    """Caps the drop bytes in flight between the watch and archive stages.
+
+    acquire() waits until the bytes fit; a drop larger than the whole budget
+    is admitted once nothing else is in flight, so it can never wait forever.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.changed = asyncio.Condition()
+
+    async def acquire(self, n: int) -> None:
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.used == 0 or self.used + n <= self.limit)
+            self.used += n
+
+    async def release(self, n: int) -> None:
+        async with self.changed:
+            self.used -= n
+            self.changed.notify_all()
+
+
+# ── Setup ─────────────────────────────────────────────────────────────────────
+def bind_vault(vault: Path) -> None:
+    """Point the watcher and reasoning-loop modules at the vault and share one set of state."""
+    watcher.VAULT_PATH = reasoning.VAULT_PATH = vault
+    watcher.INBOX = reasoning.INBOX = vault / "Inbox"
+    watcher.NEEDS_ACTION = reasoning.NEEDS_ACTION = vault / "Needs_Action"
+    watcher.DONE = reasoning.DONE = vault / "Done"
+    reasoning.APPROVED = vault / "Approved"
+    watcher.LOGS = reasoning.LOGS = vault / "Logs"
+    watcher.ATTACHMENTS = vault / "Attachments"
+    watcher.STATE = vault / ".state"
+    watcher.LOG_FILE = reasoning.LOG_FILE = watcher.LOGS / "pipeline.log"
+
+
+def setup_logging() -> None:
+    """Watcher-style console + file logging, shared by all three loggers."""
+    watcher.setup_logging()
+    for other in (logger, reasoning.logger):
+        other.setLevel(logging.DEBUG)
+        for handler in watcher.logger.handlers:
+            other.addHandler(handler)
+
+
+def open_vault() -> None:
+    watcher.open_vault()
+    reasoning.open_vault()
+    # One writer, one set of counters, one layout — shared by both halves
+    reasoning.layout = watcher.layout
+    reasoning.durable = watcher.durable
+    reasoning.counters = watcher.counters
+    reasoning.dashboard = watcher.dashboard
+
+
+def print_banner(watch: InotifyWatch | None) -> None:
+    logger.info("=" * 55)
+    logger.info("  BRONZE TIER - UNIFIED PIPELINE v1.0")
+    logger.info("=" * 55)
+    logger.info(f"  Vault:    {watcher.VAULT_PATH}")
+    logger.info(f"  Monitor:  {watcher.INBOX}")
+    logger.info(f"  Targets:  {watcher.DONE} | flagged → {watcher.NEEDS_ACTION}")
+    logger.info(f"  Layout:   {watcher.layout.layout}")
+    logger.info(f"  Log file: {watcher.LOG_FILE}")
+    if watch:
+        logger.info("  Mode:     inotify (event-driven)")
+    else:
+        logger.info(f"  Mode:     adaptive polling {watcher.POLL_INTERVAL}s → {watcher.POLL_MAX_INTERVAL}s idle cap")
+    logger.info(f"  Settle:   {watcher.SETTLE_SECONDS}s")
+    logger.info(f"  Queues:   {QUEUE_DEPTH} notes per stage, {QUEUE_BYTES // 2**20} MB in flight; "
+                f"drops over {LARGE_DROP_BYTES // 2**20} MB streamed to /Needs_Action")
+    logger.info("=" * 55)
+    logger.warning("  Press Ctrl+C to stop")
+    logger.info("=" * 55)
+
+
+# ── Stage Work (runs in worker threads) ───────────────────────────────────────
+def drop_cost(source: Path) -> int:
+    """Bytes a drop will hold in memory while queued — 0 for one too large to hold."""
+    try:
+        size = source.stat().st_size
+    except OSError:
+        return 0  # the wrap reports it
+    return 0 if size > LARGE_DROP_BYTES else size
+
+
+def wrap_in_memory(source: Path, cost: int) -> Drop | None:
+    """The watcher's wrap, into a string instead of a /Needs_Action temp file.
+
+    None if the file failed, or was a duplicate — linked to its note and never queued.
+    A drop over LARGE_DROP_BYTES is streamed to /Needs_Action by the watcher's own
+    process_file() instead, and comes back as already filed.
+    """
+    try:
+        st = source.stat()
+        if st.st_size > LARGE_DROP_BYTES:
+            logger.info(f"  {source.name} is {st.st_size:,} bytes — streamed to /Needs_Action for the reasoning loop")
+            if (filed := watcher.process_file(source)) is None:
+                return None
+            return Drop(source, st, None, "", None, cost, filed)
+        out = io.StringIO()
+        wrapped = watcher.wrap_with_metadata(source, out, DETECTED_ENTRY)
+    except watcher.DuplicateDrop as dup:
+        watcher.append_dashboard_activity([(source.name, watcher.skip_duplicate(source, st, dup), True)])
+        return None
+    except OSError as e:
+        logger.error(f"Failed wrapping {source.name}: {e}")
+        watcher.ledger.release(source.name)
+        return None
+    return Drop(source, st, out.getvalue(), wrapped.digest, wrapped.sketch, cost, attachment=wrapped.attachment)
+
+
+def write_to_needs_action(stem: str, content: str) -> Path:
+    """Publish a note that needs approval into /Needs_Action (today's shard)."""
+    names = watcher.action_shard()
+    with watcher.counters.transition("action", +1):
+        tmp, out = watcher.durable.open_temp(names.folder)
+        try:
+            with out:
+                out.write(content)
+            return names.publish(tmp, stem, watcher.durable)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def archive(drop: Drop, plan: reasoning.TaskPlan | None) -> None:
+    """File one decided note, then schedule its Inbox source for removal."""
+    source = drop.source
+    if drop.filed is not None:
+        # Streamed to /Needs_Action while wrapping — only the Dashboard row is left
+        watcher.append_dashboard_activity([drop.filed])
+        in_flight.discard(source.name)
+        return
+    plan = reasoning.settle_near_duplicate(plan)  # in filing order, like the reasoning loop
+    stem = f"{source.stem}_processed"
+    short = watcher.now_short()
+    try:
+        if plan.outcome == "completed":
+            dest = reasoning.write_to_done(stem, plan.content)
+            rel = f"/Done/{dest.relative_to(watcher.DONE).as_posix()}"
+            rows = [f"| {short} | 🧠 Pipeline | `{source.name}` → `{rel}` (auto-completed) |"]
+        else:
+            dest = write_to_needs_action(stem, plan.content)
+            watcher.counters.adjust("awaiting", +1)
+            rel = f"/Needs_Action/{dest.relative_to(watcher.NEEDS_ACTION).as_posix()}"
+            logger.warning(f"  APPROVAL NEEDED: {plan.reason}")
+            rows = [f"| {short} | ⚠️ Needs Approval | `{source.name}` → `{rel}` flagged — awaiting human review |"]
+    except OSError as e:
+        logger.error(f"Failed filing note for {source.name}: {e}")
+        if drop.attachment is not None:
+            watcher.restore_attachment(drop.attachment, source)
+        watcher.ledger.release(source.name)
+        in_flight.discard(source.name)
+        watcher.inbox_scanner.retry(source.name)
+        return
+
+    logger.info(f"  >> {source.name} --> {rel}")
+    watcher.ledger.record(source.name, drop.st, drop.digest, rel.lstrip("/"))
+    if drop.sketch is not None:
+        watcher.near_dups.add(drop.sketch, rel.lstrip("/"))
+    in_flight.discard(source.name)  # the ledger now screens it out of later scans
+    watcher.durable.after_commit(lambda: watcher.remove_source(source))
+    watcher.dashboard.add_activity(rows, [f"- [{short}] {source.name} → {rel}"])
+
+
+def commit_batch() -> None:
+    """Group commit, then persist the ledger and refresh Dashboard.md counts."""
+    try:
+        watcher.durable.commit()  # notes durable — Inbox sources are removed now
+    except OSError as e:
+        logger.error(f"Group commit failed, retried when idle: {e}")
+    watcher.ledger.flush()
+    if watcher.near_dups is not None:
+        watcher.near_dups.flush()
+    watcher.update_dashboard_counts()
+    if watcher.dashboard.flush():
+        watcher.durable.commit()
+
+
+def wait_for_drops(watch: InotifyWatch | None) -> InotifyWatch | None:
+    """Like the watcher's wait, but wakes within a second of a stop request."""
+    wake_in = [t for t in (watcher.dashboard.seconds_until_due(),
+                           watcher.inbox_scanner.seconds_until_due()) if t is not None]
+    timeout = min([watcher.poller.interval if watch is None else watcher.EVENT_RESCAN, *wake_in])
+    deadline = time.monotonic() + timeout
+
+    while not stopping.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if watch is None:
+            stopping.wait(min(1.0, remaining))
+        elif watch.wait(min(1.0, remaining)):
+            watcher.take_finished(watch)
+            break
+        elif not watch.alive:
+            watch.close()
+            logger.warning("Inbox watch lost — re-creating /Inbox and re-arming")
+            watcher.INBOX.mkdir(parents=True, exist_ok=True)
+            return watcher.open_inbox_watch()
+
+    # The debounce window may have closed while idle, or a commit failed and is retried
+    if watcher.dashboard.flush() or watcher.durable.has_pending():
+        watcher.durable.commit()
+    return watch
+
+
+# ── Stages ────────────────────────────────────────────────────────────────────
+async def watch_stage(wrap_q: asyncio.Queue, budget: ByteBudget) -> None:
+    watch = watcher.open_inbox_watch()
+    print_banner(watch)
+    while not stopping.is_set():
+        found = await asyncio.to_thread(watcher.inbox_scanner.scan)
+        fresh = sorted((f for f in found if f.name not in in_flight), key=lambda p: p.name)
+        if fresh:
+            logger.info(f"Found {len(fresh)} new file(s)")
+        for source in fresh:
+            in_flight.add(source.name)
+            cost = drop_cost(source)
+            await budget.acquire(cost)  # blocks while too many bytes are in flight
+            await wrap_q.put((source, cost))  # blocks while downstream is saturated
+        if watch is None:
+            watcher.poller.record(len(fresh), len(watcher.inbox_scanner.settling))
+        watch = await asyncio.to_thread(wait_for_drops, watch)
+    if watch:
+        watch.close()
+    await wrap_q.put(None)
+
+
+async def wrap_stage(wrap_q: asyncio.Queue, reason_q: asyncio.Queue, budget: ByteBudget) -> None:
+    while (item := await wrap_q.get()) is not None:
+        source, cost = item
+        if (drop := await asyncio.to_thread(wrap_in_memory, source, cost)) is None:
+            await budget.release(cost)
+            in_flight.discard(source.name)
+            watcher.inbox_scanner.retry(source.name)  # duplicates are screened out by the ledger
+            continue
+        await reason_q.put(drop)
+    await reason_q.put(None)
+
+
+async def reason_stage(reason_q: asyncio.Queue, archive_q: asyncio.Queue) -> None:
+    while (drop := await reason_q.get()) is not None:
+        plan = None
+        if drop.note is not None:
+            plan = await asyncio.to_thread(reasoning.evaluate_content, drop.note, PIPELINE_ENTRY)
+        await archive_q.put((drop, plan))
+    await archive_q.put(None)
+
+
+async def archive_stage(archive_q: asyncio.Queue, budget: ByteBudget) -> None:
+    pending = 0
+    while (item := await archive_q.get()) is not None:
+        await asyncio.to_thread(archive, *item)
+        await budget.release(item[0].cost)
+        pending += 1
+        if archive_q.empty():
+            # Caught up — one group commit for everything filed since the last one
+            await asyncio.to_thread(commit_batch)
+            pending = 0
+    if pending:
+        await asyncio.to_thread(commit_batch)
+
+
+async def run_pipeline() -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, request_stop, sig)
+        except (NotImplementedError, AttributeError):
+            signal.signal(sig, lambda signum, frame: request_stop(signum))  # Windows
+
+    wrap_q: asyncio.Queue = asyncio.Queue(QUEUE_DEPTH)
+    reason_q: asyncio.Queue = asyncio.Queue(QUEUE_DEPTH)
+    archive_q: asyncio.Queue = asyncio.Queue(QUEUE_DEPTH)
+    budget = ByteBudget(QUEUE_BYTES)
+    await asyncio.gather(
+        watch_stage(wrap_q, budget),
+        wrap_stage(wrap_q, reason_q, budget),
+        reason_stage(reason_q, archive_q),
+        archive_stage(archive_q, budget),
+    )
+
+    # Queues drained — final flush of everything still buffered
+    watcher.dashboard.flush(force=True)
+    watcher.durable.commit()
+    watcher.ledger.flush()
+    if watcher.near_dups is not None:
+        watcher.near_dups.flush()
+    watcher.counters.save()
+    logger.warning("Pipeline stopped — all queued files filed")
+
+
+def request_stop(signum) -> None:
+    if not stopping.is_set():
+        logger.warning(f"{signal.Signals(signum).name} received — draining queues, then stopping")
+    stopping.set()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bronze Tier Unified Pipeline — /Inbox straight to /Done, flagged tasks to /Needs_Action"
+    )
+    parser.add_argument(
+        "--vault", type=str, default=DEFAULT_VAULT,
+        help=f"Path to Obsidian vault root (default: {DEFAULT_VAULT})"
+    )
+    parser.add_argument(
+        "--queue-depth", type=int, default=QUEUE_DEPTH,
+        help=f"Notes buffered between pipeline stages (default: {QUEUE_DEPTH})"
+    )
+    parser.add_argument(
+        "--queue-mb", type=int, default=QUEUE_BYTES // 2**20,
+        help=f"Megabytes of drops held in memory across all stages (default: {QUEUE_BYTES // 2**20})"
+    )
+    parser.add_argument(
+        "--large-drop-mb", type=float, default=LARGE_DROP_BYTES / 2**20,
+        help=f"Drops bigger than this are streamed to /Needs_Action for the reasoning loop (default: {LARGE_DROP_BYTES / 2**20:g})"
+    )
+    parser.add_argument(
+        "--interval", type=int, default=watcher.POLL_INTERVAL,
+        help=f"Base poll interval in seconds (default: {watcher.POLL_INTERVAL})"
+    )
+    parser.add_argument(
+        "--max-interval", type=int, default=watcher.POLL_MAX_INTERVAL,
+        help=f"Idle back-off cap for the poll interval in seconds (default: {watcher.POLL_MAX_INTERVAL})"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=watcher.SETTLE_SECONDS,
+        help=f"Seconds a file's size and mtime must hold steady before ingest; files inotify reports finished skip it (default: {watcher.SETTLE_SECONDS})"
+    )
+    parser.add_argument(
+        "--durability", choices=DURABILITY_LEVELS, default=watcher.DURABILITY,
+        help="fsync policy: none, batch (group commit when the pipeline catches up), always (default: batch)"
+    )
+    parser.add_argument(
+        "--dashboard-debounce", type=float, default=watcher.DASHBOARD_DEBOUNCE,
+        help=f"Seconds to coalesce Dashboard.md updates before one rewrite (default: {watcher.DASHBOARD_DEBOUNCE})"
+    )
+    parser.add_argument(
+        "--dedup-ttl-days", type=float, default=watcher.DEDUP_TTL_DAYS,
+        help=f"Days identical content counts as a duplicate of its first note, 0 to disable (default: {watcher.DEDUP_TTL_DAYS})"
+    )
+    parser.add_argument(
+        "--near-dup-threshold", type=float, default=watcher.NEAR_DUP_THRESHOLD,
+        help=f"Similarity (0-1) at which a drop is marked near_duplicate_of an earlier note, 0 to disable (default: {watcher.NEAR_DUP_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--backend", choices=["auto", "inotify", "poll"], default=watcher.WATCH_BACKEND,
+        help="Inbox watch backend: inotify (Linux, event-driven), poll, or auto (default: auto)"
+    )
+    args = parser.parse_args()
+    if not 0 <= args.near_dup_threshold <= 1:
+        parser.error("--near-dup-threshold must be between 0 and 1")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    bind_vault(Path(args.vault))
+    QUEUE_DEPTH = max(1, args.queue_depth)
+    QUEUE_BYTES = max(1, args.queue_mb) * 2**20
+    LARGE_DROP_BYTES = int(args.large_drop_mb * 2**20)
+    watcher.POLL_INTERVAL = args.interval
+    watcher.POLL_MAX_INTERVAL = args.max_interval
+    watcher.SETTLE_SECONDS = args.settle
+    watcher.DURABILITY = reasoning.DURABILITY = args.durability
+    watcher.DASHBOARD_DEBOUNCE = args.dashboard_debounce
+    watcher.DEDUP_TTL_DAYS = args.dedup_ttl_days
+    watcher.NEAR_DUP_THRESHOLD = args.near_dup_threshold
+    watcher.WATCH_BACKEND = args.backend
+
+    setup_logging()
+    open_vault()
+    asyncio.run(run_pipeline())
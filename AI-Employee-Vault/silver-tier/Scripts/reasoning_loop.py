@@ -4,28 +4,71 @@ Processes pending tasks in /Needs_Action:
   - Reads content + YAML frontmatter
   - Checks Company_Handbook rules (payments, sensitive actions)
   - Auto-completes or flags for approval
+  - Completes tasks a human approved (`status: approved`, or moved to /Approved)
+  - Closes near-duplicates of a task still awaiting the same approval (never payments)
   - Moves completed tasks to /Done
   - Updates Dashboard.md counts + activity
   - Logs to /Logs/reasoning.log
+One-shot by default; --daemon stays resident and reacts to new tasks and approvals.
 """
 
 from pathlib import Path
 from datetime import datetime
 import argparse
 import logging
+import os
 import re
+import signal
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import NamedTuple
+
+from approval_rules import EXTERNAL_COMMS, PAYMENT_AMOUNT, HandbookRules, RuleMatch
+from dashboard import DashboardWriter
+from near_duplicates import figures
+from note_moves import NoteMoves
+from recipient_index import ApprovedRecipients, extract_recipients, format_recipients, parse_recipients
+from vault_counters import FolderCounters
+from vault_io import DURABILITY_LEVELS, DurableWriter, NameAllocator
+from task_document import ACTION_LOG, FULL_CONTENT, TaskDocument
+from task_index import TaskIndex, TaskRecord
+from vault_layout import VaultLayout
+from vault_watch import InotifyWatch
 
 # ── Config ────────────────────────────────────────────────────────────────────
 DEFAULT_VAULT = r"E:\Personal-AI-Employee-Hackathon-0\AI-Employee-Vault\bronze-tier"
+DURABILITY = "batch"  # none | batch | always — see vault_io.DurableWriter
+HEADER_MAX_CHARS = 16 * 1024  # frontmatter larger than this is not treated as a task header
+JOBS = 1  # worker processes evaluating tasks
+JOB_CHUNK_MAX = 256  # tasks per worker round-trip
+DAEMON_RESCAN = 60  # seconds — daemon full rescan; events in between touch only the changed notes
+DAEMON_POLL = 10  # seconds — daemon poll interval where inotify is unavailable
+FINISHED = ("completed", "duplicate")  # statuses written in place just before the move into /Done
+MOVES_TTL_DAYS = 30  # note moves are remembered this long — past the watcher's --dedup-ttl-days
 
 VAULT_PATH: Path
 NEEDS_ACTION: Path
 DONE: Path
+APPROVED: Path
 INBOX: Path
 LOGS: Path
 LOG_FILE: Path
 
+layout: VaultLayout
+done_names: NameAllocator | None = None
+counters: FolderCounters
+task_index: TaskIndex
+note_moves: NoteMoves
+handbook_rules: HandbookRules
+approved_recipients: ApprovedRecipients
+dashboard: DashboardWriter
+durable: DurableWriter
+pool: ProcessPoolExecutor | None = None
+stopping = threading.Event()  # set by SIGTERM / Ctrl+C in daemon mode
+
 logger = logging.getLogger("reasoning-loop")
 
 
@@ -89,220 +132,607 @@ def parse_frontmatter(content: str) -> dict:
     return fm
 
 
-def update_frontmatter(content: str, updates: dict) -> str:
-    """Update or add keys in YAML frontmatter."""
-    match = re.match(r"^(---\s*\n)(.*?)(\n---)", content, re.DOTALL)
-    if not match:
-        return content
+def read_frontmatter(path: Path, limit: int = HEADER_MAX_CHARS) -> dict:
+    """Parse a note's frontmatter without reading its body.
+
+    Reads line by line only until the closing `---`, and gives up after limit
+    characters — so the cost is the header's size, not the file's.
+    """
+    lines = []
+    size = 0
+    with path.open("r", encoding="utf-8") as f:
+        first = f.readline(limit)
+        if not first.startswith("---"):
+            return {}
+        lines.append(first)
+        size += len(first)
+        while size < limit:
+            line = f.readline(limit - size)
+            if not line:
+                break
+            lines.append(line)
+            size += len(line)
+            if line.startswith("---"):
+                return parse_frontmatter("".join(lines))
+    return {}
 
-    fm_text = match.group(2)
 
-    for key, val in updates.items():
-        pattern = rf"^{re.escape(key)}:.*$"
-        if re.search(pattern, fm_text, re.MULTILINE):
-            fm_text = re.sub(pattern, f"{key}: {val}", fm_text, flags=re.MULTILINE)
-        else:
-            fm_text += f"\n{key}: {val}"
+# ── Handbook Compliance Check ─────────────────────────────────────────────────
+def check_needs_approval(content: str, recipients: frozenset[str]) -> tuple[list[RuleMatch], list[RuleMatch], str]:
+    """Check content against Handbook rules. Returns (blocking, waived, handbook_version).
+
+    Every matching rule is reported. External communication needs approval
+    only the first time per recipient, so that match is waived when every
+    recipient in the task has been approved before.
+    """
+    engine, version = handbook_rules.current()
+    blocking, waived = [], []
+    for match in engine.evaluate(content):
+        if match.rule == EXTERNAL_COMMS.name:
+            approved_recipients.refresh()
+            if approved_recipients.covers(recipients):
+                waived.append(match)
+                continue
+        blocking.append(match)
+    return blocking, waived, version
 
-    return match.group(1) + fm_text + match.group(3) + content[match.end():]
 
+def full_content(doc: TaskDocument) -> str:
+    """The dropped file's text under "## Full Content" — not the title, preview or action log."""
+    body = doc.body
+    start = body.find(f"\n{FULL_CONTENT}\n")
+    start = 0 if start < 0 else start + len(FULL_CONTENT) + 2
+    end = body.rfind(f"\n{ACTION_LOG}")
+    return body[start:end] if end >= start else body[start:]
 
-def append_action_log(content: str, entry: str) -> str:
-    """Append an entry to the ## Action Log section."""
-    timestamp = now_str()
-    log_line = f"- [{timestamp}] {entry}"
-
-    if "## Action Log" in content:
-        content = content.replace(
-            "## Action Log",
-            f"## Action Log\n{log_line}",
-            1
-        )
-    else:
-        content += f"\n## Action Log\n{log_line}\n"
-    return content
 
+def approval_key(recipients: frozenset[str], blocking: list[RuleMatch], doc: TaskDocument) -> tuple:
+    """What a note awaits approval for: recipients, blocking reasons and the numbers
+    (references, IDs, amounts) in its content. A near-duplicate is closed only on an exact match."""
+    return recipients, tuple(m.reason for m in blocking), tuple(figures(full_content(doc)))
 
-# ── Handbook Compliance Check ─────────────────────────────────────────────────
-APPROVAL_PATTERNS = [
-    (r"\$\s*(\d+)", "payment_amount"),       # Dollar amounts
-    (r"(?i)\b(pay|payment|invoice)\b", "payment_keyword"),
-    (r"(?i)\b(send|email|message|notify)\b", "external_comms"),
-    (r"(?i)\b(delete|remove|drop)\b", "destructive_action"),
-]
-
-
-def check_needs_approval(content: str) -> tuple[bool, str]:
-    """Check content against Handbook rules. Returns (needs_approval, reason)."""
-    # Check for payment amounts > $100
-    amounts = re.findall(r"\$\s*(\d+(?:\.\d+)?)", content)
-    for amt_str in amounts:
-        try:
-            if float(amt_str) > 100:
-                return True, f"Payment amount ${amt_str} exceeds $100 threshold"
-        except ValueError:
-            pass
-
-    # Check for external communication keywords
-    if re.search(r"(?i)\b(send|email|message)\b.*\b(external|client|vendor|outside)\b", content):
-        return True, "Contains external communication — requires first-time approval"
 
-    # Check for destructive actions on shared files
-    if re.search(r"(?i)\b(delete|remove)\b.*\b(shared|team|production)\b", content):
-        return True, "Destructive action on shared resource"
+def awaiting_same(near: "NearDuplicate") -> bool:
+    """True if the note a task nearly duplicates is still awaiting exactly the same approval.
 
-    return False, ""
+    Checked when the plan is applied, in task order, so an original decided
+    earlier in the same run counts as decided — whatever --jobs is.
+    """
+    try:
+        content = (VAULT_PATH / near.note).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError, ValueError):
+        return False
+    original = TaskDocument(content)
+    if original.get("status") != "awaiting_approval":
+        return False
+    recipients = extract_recipients(content)
+    blocking, _, _ = check_needs_approval(content, recipients)
+    return approval_key(recipients, blocking, original) == near.approval
+
+
+def get_done_names() -> NameAllocator:
+    """Name allocator for /Done (or today's shard of it), built from one listing on first use."""
+    global done_names
+    shard = layout.shard(DONE)
+    if done_names is None or done_names.folder != shard:
+        shard.mkdir(parents=True, exist_ok=True)
+        done_names = NameAllocator(shard)
+    return done_names
 
 
 # ── Core Processing ───────────────────────────────────────────────────────────
-def get_pending_tasks(target: str = None) -> list[Path]:
-    """Find pending tasks in /Needs_Action."""
-    tasks = []
+def is_actionable(record: TaskRecord) -> bool:
+    """Pending, approved by a human, or held only for recipients approved since."""
+    if record.status in ("pending", "approved"):
+        return True
+    return (record.status == "awaiting_approval" and bool(record.recipients)
+            and approved_recipients.covers(parse_recipients(record.recipients)))
+
+
+def is_finished(path: Path) -> bool:
+    """True for a note already rewritten as completed — only its move into /Done is left."""
     try:
-        for f in sorted(NEEDS_ACTION.iterdir()):
-            if not f.is_file() or f.suffix != ".md":
-                continue
-            if target and f.name != target:
-                continue
+        return read_frontmatter(path).get("status") in FINISHED
+    except (OSError, UnicodeDecodeError):
+        return False
 
-            content = f.read_text(encoding="utf-8")
-            fm = parse_frontmatter(content)
 
-            if fm.get("status") == "pending":
-                tasks.append(f)
+def get_approved_notes(target: str = None) -> list[Path]:
+    """Notes a human moved into /Approved (name order), minus any whose move into /Done was interrupted."""
+    try:
+        with os.scandir(APPROVED) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".md") and e.is_file()
+                           and not e.name.startswith("."))
+    except FileNotFoundError:
+        return []
+    return [APPROVED / name for name in names
+            if (not target or name == target) and not is_finished(APPROVED / name)]
+
+
+def get_pending_tasks(target: str = None) -> list[Path]:
+    """Find tasks to run: /Needs_Action (every shard, oldest first), then /Approved."""
+    tasks = []
+    approved_recipients.refresh()
+    try:
+        current = layout.shard(NEEDS_ACTION)
+        try:
+            folder_mtime = current.stat().st_mtime_ns
+        except FileNotFoundError:
+            if current == NEEDS_ACTION:
+                raise
+            folder_mtime = None  # no notes for today yet
+        file_count = 0
+        current_count = 0
+        awaiting = 0
+        seen = set()
+        for shard in layout.shards(NEEDS_ACTION):
+            prefix = "" if shard == NEEDS_ACTION else shard.relative_to(NEEDS_ACTION).as_posix() + "/"
+            is_current = shard == current
+            shard_tasks = []
+            with os.scandir(shard) as it:
+                entries = list(it)
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                file_count += 1
+                if is_current:
+                    current_count += 1
+                if not entry.name.endswith(".md"):
+                    continue
+                if target and entry.name != target:
+                    continue
+
+                key = prefix + entry.name
+                seen.add(key)
+                try:
+                    st = os.stat(entry.path)  # not entry.stat(): on Windows its st_ino is always 0
+                    if (record := task_index.lookup(key, st)) is None:
+                        # New or changed since the last run — only these are opened
+                        record = task_index.update(key, st, read_frontmatter(Path(entry.path)))
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.warning(f"Skipping unreadable task {entry.name}: {e}")
+                    continue
+
+                if is_actionable(record):
+                    shard_tasks.append(entry.path)
+                elif record.status == "awaiting_approval":
+                    awaiting += 1
+            # Only the actionable notes need sorting — not every entry in the shard
+            tasks.extend(Path(path) for path in sorted(shard_tasks))
+
+        # A full scan doubles as the Needs_Action and awaiting_approval counts
+        if not target:
+            counters.observe("action", file_count, folder_mtime, current_count)
+            counters.set("awaiting", awaiting)
+            task_index.retain(seen)
+        task_index.save()
     except FileNotFoundError:
         logger.error(f"Needs_Action folder not found: {NEEDS_ACTION}")
     except PermissionError:
         logger.error(f"Permission denied reading: {NEEDS_ACTION}")
 
+    try:
+        tasks += get_approved_notes(target)
+    except OSError as e:
+        logger.error(f"Cannot read {APPROVED}: {e}")
     return tasks
 
 
-def process_task(task_path: Path) -> str:
-    """Process a single task. Returns: 'completed', 'approval_needed', or 'error'."""
+def get_changed_tasks(paths: set[Path]) -> list[Path]:
+    """Find tasks among notes that just changed — without scanning the backlog.
+
+    Covers new notes and status edits in any /Needs_Action shard, and notes
+    moved into /Approved. The awaiting_approval count is adjusted for notes
+    that left that state; the next full scan recounts it anyway.
+    """
+    tasks = []
+    approved_recipients.refresh()
+    for path in sorted(paths):
+        try:
+            if path.parent == APPROVED:
+                status = read_frontmatter(path).get("status")
+                if status == "awaiting_approval":
+                    counters.adjust("awaiting", -1)  # a flagged note, moved here by a human
+                if status not in FINISHED:
+                    tasks.append(path)
+                continue
+
+            key = path.relative_to(NEEDS_ACTION).as_posix()
+            previous = task_index.get(key)
+            st = path.stat()
+            if (record := task_index.lookup(key, st)) is None:
+                record = task_index.update(key, st, read_frontmatter(path))
+        except FileNotFoundError:
+            continue  # already moved on (completed, or moved by a human)
+        except ValueError:
+            continue  # not a task folder
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Skipping unreadable task {path.name}: {e}")
+            continue
+
+        actionable = is_actionable(record)
+        if (previous is not None and previous.status == "awaiting_approval"
+                and (actionable or record.status != "awaiting_approval")):
+            counters.adjust("awaiting", -1)
+        if actionable:
+            tasks.append(path)
+
+    task_index.save()
+    return tasks
+
+
+class NearDuplicate(NamedTuple):
+    note: str  # vault path of the earlier note
+    approval: tuple  # the approval_key() it must still be awaiting
+    content: str  # this note, closed as a duplicate of it
+
+
+class TaskPlan(NamedTuple):
+    outcome: str  # completed | approval_needed | error
+    content: str  # the updated note
+    original: str
+    reason: str  # approval reason, or the error message
+    approved: frozenset[str] = frozenset()  # recipients a human signed off on with this task
+    near: NearDuplicate | None = None  # closes the task instead, if still awaiting_same() when applied
+
+
+def evaluate_task(task_path: Path) -> TaskPlan:
+    """Read a task, check it against the handbook and build its updated note.
+
+    Writes nothing — it can run in a worker process while the caller applies
+    plans (file moves, counters) in task order.
+    """
     try:
         content = task_path.read_text(encoding="utf-8")
     except Exception as e:
-        logger.error(f"Cannot read {task_path.name}: {e}")
-        return "error"
+        return TaskPlan("error", "", "unknown", f"Cannot read {task_path.name}: {e}")
+    if task_path.parent == APPROVED:
+        return evaluate_content(content, "Moved from /Approved to /Done", approved=True)
+    return evaluate_content(content)
 
-    fm = parse_frontmatter(content)
-    logger.info(f"  Processing: {task_path.name} (original: {fm.get('original', 'unknown')})")
 
-    # Step 1: Check handbook compliance
-    needs_approval, reason = check_needs_approval(content)
+def evaluate_content(content: str, moved: str = "Moved from /Needs_Action to /Done",
+                     approved: bool = False) -> TaskPlan:
+    """Decide a note's outcome and build its updated text; moved is the final action-log entry.
 
-    if needs_approval:
-        logger.warning(f"  APPROVAL NEEDED: {reason}")
-        content = update_frontmatter(content, {"status": "awaiting_approval"})
-        content = append_action_log(content, f"Flagged for approval: {reason}")
+    approved marks a note a human approved by moving it, whatever its status says.
+    """
+    doc = TaskDocument(content)
+    original = doc.get("original", "unknown")
+    status = doc.get("status", "pending")
+    recipients = extract_recipients(content)
 
-        try:
-            task_path.write_text(content, encoding="utf-8")
-        except Exception as e:
-            logger.error(f"Cannot update {task_path.name}: {e}")
-            return "error"
+    if approved or status == "approved":
+        # A human signed off — complete it and remember everyone it goes to
+        timestamp = now_str()
+        doc.set({"status": "completed", "completed": timestamp, "processed_by": "bronze-reasoning-loop"})
+        doc.log("Approved by human — completed", timestamp)
+        doc.log(f"Status changed: {status} → completed", timestamp)
+        doc.log(moved, timestamp)
+        return TaskPlan("completed", doc.serialize(), original, "", recipients)
 
-        return "approval_needed"
+    # Step 1: Check handbook compliance
+    blocking, waived, version = check_needs_approval(content, recipients)
+
+    note = doc.get("near_duplicate_of")
+    link = f"[[{note.removesuffix('.md')}]]"
+    near = None
+    if blocking and note and not any(m.rule == PAYMENT_AMOUNT for m in blocking):
+        # Payments never qualify — two invoices can read alike and both be owed.
+        # Otherwise it is closed if the original still awaits the same approval when applied.
+        closed = TaskDocument(content)
+        timestamp = now_str()
+        closed.set({
+            "status": "duplicate",
+            "completed": timestamp,
+            "processed_by": "bronze-reasoning-loop",
+            "handbook_version": version,
+        })
+        closed.log(f"Near duplicate of {link}, which awaits the same approval — closed", timestamp)
+        closed.log(f"Status changed: {status} → duplicate", timestamp)
+        closed.log(moved, timestamp)
+        near = NearDuplicate(note, approval_key(recipients, blocking, doc), closed.serialize())
+
+    if blocking:
+        reason = "; ".join(m.reason for m in blocking)
+        updates = {"status": "awaiting_approval", "handbook_version": version}
+        if recipients and all(m.rule == EXTERNAL_COMMS.name for m in blocking):
+            # Only a first-time recipient holds it up — re-checked once they are approved
+            updates["recipients"] = format_recipients(recipients)
+        elif doc.get("recipients"):
+            updates["recipients"] = ""
+        doc.set(updates)
+        timestamp = now_str()
+        if note:
+            doc.log(f"Near duplicate of {link} — flagged on its own", timestamp)
+        doc.log(f"Flagged for approval: {reason}", timestamp)
+        return TaskPlan("approval_needed", doc.serialize(), original, reason, near=near)
 
     # Step 2: Auto-complete
     timestamp = now_str()
-    content = update_frontmatter(content, {
+    doc.set({
         "status": "completed",
         "completed": timestamp,
         "processed_by": "bronze-reasoning-loop",
+        "handbook_version": version,
     })
-    content = append_action_log(content, "Processed by reasoning loop — auto-completed")
-    content = append_action_log(content, "Status changed: pending → completed")
-    content = append_action_log(content, "Moved from /Needs_Action to /Done")
+    doc.log("Processed by reasoning loop — auto-completed", timestamp)
+    if waived:
+        doc.log(f"Recipient(s) approved before: {format_recipients(recipients)}", timestamp)
+    doc.log(f"Status changed: {status} → completed", timestamp)
+    doc.log(moved, timestamp)
+    return TaskPlan("completed", doc.serialize(), original, "")
+
+
+def write_to_done(stem: str, content: str) -> Path:
+    """Write a completed note into /Done (today's shard) under the first free name for stem."""
+    names = get_done_names()
+    with counters.transition("done", +1):
+        tmp, out = durable.open_temp(names.folder)
+        try:
+            with out:
+                out.write(content)
+            return names.publish(tmp, stem, durable)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def move_to_done(task_path: Path) -> Path:
+    """Rename a completed note from /Needs_Action (or /Approved) into /Done under a free name.
+
+    Same filesystem, so this is a metadata-only move — the note was already
+    rewritten in place. Until the old name is unlinked the note is hard-linked
+    into both folders; recover_moves() finishes that after a crash.
+    """
+    names = get_done_names()
+    queued = task_path.is_relative_to(NEEDS_ACTION)
+    with counters.transition("action", -1, task_path.parent) if queued else nullcontext():
+        with counters.transition("done", +1):
+            dest = names.publish(task_path, task_path.stem, durable)
+    if queued:
+        task_index.forget(task_path.relative_to(NEEDS_ACTION).as_posix())
+    # The watcher links later duplicates of this note by the path it was filed under
+    note_moves.record(task_path.relative_to(VAULT_PATH).as_posix(), dest.relative_to(VAULT_PATH).as_posix())
+    return dest
+
+
+def get_finished_approved() -> list[Path]:
+    """Notes in /Approved already rewritten as completed — a move into /Done was interrupted."""
+    try:
+        with os.scandir(APPROVED) as it:
+            notes = [Path(e.path) for e in it if e.name.endswith(".md") and e.is_file()]
+    except FileNotFoundError:
+        return []
+    return [path for path in notes if is_finished(path)]
+
+
+def recover_moves() -> None:
+    """Finish completions interrupted between the in-place rewrite and the move into /Done.
+
+    A note in /Needs_Action or /Approved that already says `status: completed`
+    is one of those: if it has a second hard link, its /Done name exists and
+    only the old name is dropped; otherwise it is moved now.
+    """
+    recovered = 0
+    for shard in layout.shards(NEEDS_ACTION):
+        prefix = "" if shard == NEEDS_ACTION else shard.relative_to(NEEDS_ACTION).as_posix() + "/"
+        try:
+            with os.scandir(shard) as it:
+                entries = [e for e in it if e.name.endswith(".md") and e.is_file()]
+        except OSError:
+            continue
+        for entry in entries:
+            key = prefix + entry.name
+            task_path = Path(entry.path)
+            try:
+                st = os.stat(entry.path)  # entry.stat() reports st_nlink and st_ino as 0 on Windows
+                if (record := task_index.lookup(key, st)) is None:
+                    record = task_index.update(key, st, read_frontmatter(task_path))
+                if record.status not in FINISHED:
+                    continue
+                if st.st_nlink > 1:
+                    with counters.transition("action", -1, shard):
+                        task_path.unlink()
+                    durable.unlinked(task_path)
+                    task_index.forget(key)
+                    logger.warning(f"  Recovered {key}: already in /Done, dropped from /Needs_Action")
+                else:
+                    dest = move_to_done(task_path)
+                    logger.warning(f"  Recovered {key} --> /Done/{dest.relative_to(DONE).as_posix()}")
+                recovered += 1
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error(f"Cannot recover {entry.name}: {e}")
+
+    for task_path in get_finished_approved():
+        try:
+            if task_path.stat().st_nlink > 1:
+                task_path.unlink()
+                durable.unlinked(task_path)
+                logger.warning(f"  Recovered Approved/{task_path.name}: already in /Done, dropped from /Approved")
+            else:
+                dest = move_to_done(task_path)
+                logger.warning(f"  Recovered Approved/{task_path.name} --> /Done/{dest.relative_to(DONE).as_posix()}")
+            recovered += 1
+        except OSError as e:
+            logger.error(f"Cannot recover {task_path.name}: {e}")
+
+    if recovered:
+        durable.commit()
+        note_moves.flush()
+        counters.current()  # settle any folder the recovery found out of step
+        counters.save()
+    task_index.save()
+
+
+def settle_near_duplicate(plan: TaskPlan) -> TaskPlan:
+    """Close a flagged near-duplicate whose original still awaits the same approval."""
+    if plan.near is not None and awaiting_same(plan.near):
+        return plan._replace(outcome="completed", content=plan.near.content, reason="", near=None)
+    return plan
+
+
+def apply_task(task_path: Path, plan: TaskPlan) -> str:
+    """Carry out an evaluated task. Returns: 'completed', 'approval_needed', or 'error'."""
+    if plan.outcome == "error":
+        logger.error(plan.reason)
+        return "error"
+    plan = settle_near_duplicate(plan)
+
+    logger.info(f"  Processing: {task_path.name} (original: {plan.original})")
 
-    # Step 3: Write to Done
-    dest = DONE / task_path.name
-    counter = 1
-    while dest.exists():
-        dest = DONE / f"{task_path.stem}_{counter}.md"
-        counter += 1
+    if plan.outcome == "approval_needed":
+        logger.warning(f"  APPROVAL NEEDED: {plan.reason}")
+        try:
+            with counters.transition("action", 0, task_path.parent):
+                durable.write_text(task_path, plan.content)
+        except Exception as e:
+            logger.error(f"Cannot update {task_path.name}: {e}")
+            return "error"
 
+        counters.adjust("awaiting", +1)
+        return "approval_needed"
+
+    # Step 3: Rewrite the note in place (atomic temp file + rename)
     try:
-        dest.write_text(content, encoding="utf-8")
-        logger.info(f"  >> {task_path.name} --> /Done/{dest.name}")
+        queued = task_path.is_relative_to(NEEDS_ACTION)
+        with counters.transition("action", 0, task_path.parent) if queued else nullcontext():
+            durable.write_text(task_path, plan.content)
     except Exception as e:
-        logger.error(f"Cannot write to Done: {e}")
+        logger.error(f"Cannot update {task_path.name}: {e}")
         return "error"
 
-    # Step 4: Delete from Needs_Action
+    # Step 4: Rename it into Done — left for recover_moves() if this fails
     try:
-        task_path.unlink()
+        dest = move_to_done(task_path)
+        logger.info(f"  >> {task_path.name} --> /Done/{dest.relative_to(DONE).as_posix()}")
     except Exception as e:
-        logger.error(f"Cannot delete {task_path.name}: {e}")
+        logger.error(f"Cannot move {task_path.name} to Done: {e}")
         return "error"
 
+    if plan.approved and (new := approved_recipients.add(plan.approved, dest.name, now_str())):
+        logger.info(f"  Approved recipient(s) recorded: {', '.join(new)}")
+
     return "completed"
 
 
-def update_dashboard(completed: list[str], flagged: list[str]) -> None:
-    """Update Dashboard.md with counts and activity."""
-    dashboard = VAULT_PATH / "Dashboard.md"
-    if not dashboard.exists():
-        logger.warning("Dashboard.md not found")
-        return
+def process_task(task_path: Path) -> str:
+    """Process a single task. Returns: 'completed', 'approval_needed', or 'error'."""
+    return apply_task(task_path, evaluate_task(task_path))
+
+
+def init_worker(handbook: Path, recipients_file: Path, vault: Path) -> None:
+    """Process-pool initializer: each worker compiles its own handbook rules, quietly."""
+    global handbook_rules, approved_recipients, VAULT_PATH, APPROVED
+    VAULT_PATH, APPROVED = vault, vault / "Approved"
+    # Shutdown signals are the parent's to handle — it finishes in-flight tasks first
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    quiet = logging.getLogger("reasoning-loop-worker")
+    quiet.addHandler(logging.NullHandler())
+    quiet.propagate = False
+    handbook_rules = HandbookRules(handbook, quiet)
+    approved_recipients = ApprovedRecipients(recipients_file)
+
+
+def process_batch(tasks: list[Path]) -> list[str]:
+    """Process tasks in order — evaluated across a process pool when JOBS > 1.
+
+    Workers only read and decide; every write, move and counter update is
+    applied here, in task order, so results match the sequential path.
+    """
+    results = []
+    if JOBS <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            if stopping.is_set():
+                break  # shutting down — the rest stay pending for the next run
+            results.append(process_task(task))
+        return results
+
+    global pool
+    handbook_rules.current()  # log the rule set once here; workers load theirs quietly
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=JOBS, initializer=init_worker,
+                                   initargs=(handbook_rules.path, approved_recipients.state_file, VAULT_PATH))
+    chunksize = max(1, min(JOB_CHUNK_MAX, len(tasks) // (JOBS * 4)))
+    plans = pool.map(evaluate_task, tasks, chunksize=chunksize)
+    for task, plan in zip(tasks, plans):
+        results.append(apply_task(task, plan))
+        if stopping.is_set():
+            break  # unapplied plans are discarded — evaluation wrote nothing
+    plans.close()
+    return results
+
+
+def shutdown_pool() -> None:
+    global pool
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+        pool = None
 
-    try:
-        inbox_count = sum(1 for f in INBOX.iterdir() if f.is_file())
-        action_count = sum(1 for f in NEEDS_ACTION.iterdir() if f.is_file())
-        done_count = sum(1 for f in DONE.iterdir() if f.is_file())
-    except OSError as e:
-        logger.error(f"Error counting folders: {e}")
-        return
 
-    try:
-        content = dashboard.read_text(encoding="utf-8")
-        timestamp = now_str()
-        short = now_short()
-
-        # Update counts
-        content = re.sub(r"(🕐 Last updated \| ).+", f"\\g<1>{timestamp} |", content)
-        content = re.sub(r"(📥 Inbox items \| )\d+", f"\\g<1>{inbox_count}", content)
-        content = re.sub(r"(⚡ Needs_Action items \| )\d+", f"\\g<1>{action_count}", content)
-        content = re.sub(r"(✅ Done items \| )\d+", f"\\g<1>{done_count}", content)
-        content = re.sub(r"(📥 `/Inbox` \| )\d+", f"\\g<1>{inbox_count}", content)
-        content = re.sub(r"(⚡ `/Needs_Action` \| )\d+", f"\\g<1>{action_count}", content)
-        content = re.sub(r"(✅ `/Done` \| )\d+", f"\\g<1>{done_count}", content)
-
-        # Add activity rows
-        divider = "|------|--------|---------|"
-        new_rows = []
-        for name in completed:
-            new_rows.append(f"| {short} | 🧠 Reasoning Loop | `{name}` processed → /Done |")
-        for name in flagged:
-            new_rows.append(f"| {short} | ⚠️ Needs Approval | `{name}` flagged — awaiting human review |")
-
-        if new_rows and divider in content:
-            insert = divider + "\n" + "\n".join(new_rows)
-            content = content.replace(divider, insert, 1)
-
-        dashboard.write_text(content, encoding="utf-8")
-        logger.info(f"  Dashboard updated: Inbox={inbox_count} | Action={action_count} | Done={done_count}")
-    except Exception as e:
-        logger.error(f"Failed updating Dashboard: {e}")
+def update_dashboard(completed: list[str], flagged: list[str]) -> None:
+    """Update Dashboard.md with counts and activity in a single rewrite."""
+    short = now_short()
+    rows = []
+    for name in completed:
+        rows.append(f"| {short} | 🧠 Reasoning Loop | `{name}` processed → /Done |")
+    for name in flagged:
+        rows.append(f"| {short} | ⚠️ Needs Approval | `{name}` flagged — awaiting human review |")
+
+    dashboard.set_counts(counters.current())
+    dashboard.add_activity(rows)
+    dashboard.flush(force=True)
+    durable.commit()
+    note_moves.flush()
+    counters.save()
+    task_index.save()
+    approved_recipients.save()
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
-def run_reasoning_loop(target: str = None) -> None:
-    """Run the reasoning loop on pending tasks."""
+def print_banner(mode: str) -> None:
     logger.info("=" * 55)
     logger.info("  BRONZE TIER - REASONING LOOP v1.0")
     logger.info("=" * 55)
     logger.info(f"  Vault:  {VAULT_PATH}")
-    logger.info(f"  Source: {NEEDS_ACTION}")
+    logger.info(f"  Source: {NEEDS_ACTION} | approvals: {APPROVED}")
     logger.info(f"  Target: {DONE}")
+    logger.info(f"  Jobs:   {JOBS}")
+    logger.info(f"  Mode:   {mode}")
     logger.info("=" * 55)
 
-    tasks = get_pending_tasks(target)
+
+def open_vault() -> None:
+    """Load vault state once — kept warm across cycles in daemon mode."""
+    global layout, counters, task_index, note_moves, handbook_rules, approved_recipients, dashboard, durable
+    layout = VaultLayout(VAULT_PATH)
+    durable = DurableWriter(DURABILITY)
+    for folder in [VAULT_PATH, *layout.shards(NEEDS_ACTION), *layout.shards(DONE)]:
+        if removed := DurableWriter.sweep_temps(folder):
+            logger.warning(f"Removed {removed} stale temp file(s) from {folder}")
+    counters = FolderCounters(
+        VAULT_PATH / ".state" / "counters.json",
+        {"inbox": INBOX, "action": NEEDS_ACTION, "done": DONE},
+        layout, sharded=("action", "done"),
+    )
+    task_index = TaskIndex(VAULT_PATH / ".state" / "task_index.bin")
+    note_moves = NoteMoves(VAULT_PATH / ".state" / "note_moves.jsonl", MOVES_TTL_DAYS * 86400)
+    handbook_rules = HandbookRules(VAULT_PATH / "Company_Handbook.md", logger)
+    approved_recipients = ApprovedRecipients(VAULT_PATH / ".state" / "approved_recipients.json")
+    dashboard = DashboardWriter(VAULT_PATH / "Dashboard.md", logger, durable)
+
+
+def run_cycle(target: str = None, changed: set[Path] | None = None) -> tuple[list[str], list[str], list[str]] | None:
+    """One pass over /Needs_Action and /Approved — or over just the changed notes.
+
+    Returns (completed, flagged, errors), or None if nothing was pending.
+    """
+    tasks = get_pending_tasks(target) if changed is None else get_changed_tasks(changed)
 
     if not tasks:
-        logger.info("No pending tasks in /Needs_Action")
-        return
+        counters.save()
+        return None
 
     logger.info(f"Found {len(tasks)} pending task(s)")
 
@@ -310,8 +740,7 @@ def run_reasoning_loop(target: str = None) -> None:
     flagged = []
     errors = []
 
-    for task in tasks:
-        result = process_task(task)
+    for task, result in zip(tasks, process_batch(tasks)):
         if result == "completed":
             completed.append(task.name)
         elif result == "approval_needed":
@@ -319,10 +748,25 @@ def run_reasoning_loop(target: str = None) -> None:
         else:
             errors.append(task.name)
 
+    # One group commit for the whole run
+    durable.commit()
+    for shard in sorted({task.parent for task in tasks if task.parent != APPROVED}):
+        layout.prune(NEEDS_ACTION, shard)  # drop drained date shards
+
     # Update dashboard
+    learned = bool(approved_recipients.staged)
     update_dashboard(completed, flagged)
 
-    # Summary
+    if learned and not target and not stopping.is_set():
+        # Tasks held only for a recipient approved in this pass can go through now
+        if follow_up := run_cycle():
+            completed += follow_up[0]
+            flagged += follow_up[1]
+            errors += follow_up[2]
+    return completed, flagged, errors
+
+
+def log_summary(completed: list[str], flagged: list[str], errors: list[str]) -> None:
     logger.info("=" * 55)
     logger.info("  REASONING LOOP COMPLETE")
     logger.info(f"  Completed:      {len(completed)}")
@@ -338,6 +782,121 @@ def run_reasoning_loop(target: str = None) -> None:
         logger.error(f"  Failed: {', '.join(errors)}")
 
 
+def run_reasoning_loop(target: str = None) -> None:
+    """Run the reasoning loop on pending tasks."""
+    print_banner("one-shot")
+    open_vault()
+    recover_moves()
+
+    try:
+        result = run_cycle(target)
+    finally:
+        shutdown_pool()
+
+    if result is None:
+        logger.info("No pending tasks in /Needs_Action or /Approved")
+        return
+    log_summary(*result)
+
+
+# ── Daemon ────────────────────────────────────────────────────────────────────
+def request_stop(signum, frame) -> None:
+    if not stopping.is_set():
+        logger.warning(f"{signal.Signals(signum).name} received — finishing in-flight tasks, then stopping")
+    stopping.set()
+
+
+def open_task_watch() -> InotifyWatch | None:
+    """Watch every /Needs_Action shard and /Approved, or return None to poll.
+
+    Today's shard receives new tasks; older shards only see status edits on
+    flagged notes; /Approved receives notes a human approved by moving them.
+    """
+    folder = layout.shard(NEEDS_ACTION)
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        APPROVED.mkdir(parents=True, exist_ok=True)
+        # Notes are published with os.link, which only raises IN_CREATE
+        events = InotifyWatch.IN_CLOSE_WRITE | InotifyWatch.IN_MOVED_TO | InotifyWatch.IN_CREATE
+        watch = InotifyWatch(folder, logger, events, collect=True)
+    except OSError as e:
+        logger.warning(f"inotify unavailable ({e}) — polling /Needs_Action every {DAEMON_POLL}s")
+        return None
+    try:
+        for other in [*layout.shards(NEEDS_ACTION), APPROVED]:
+            if other != folder:
+                watch.add(other)
+    except OSError as e:
+        watch.close()
+        logger.warning(f"Cannot watch every task folder ({e}) — polling /Needs_Action every {DAEMON_POLL}s")
+        return None
+    return watch
+
+
+def wait_for_tasks(watch: InotifyWatch | None, deadline: float) -> tuple[InotifyWatch | None, set[Path] | None]:
+    """Block until task notes change, the rescan deadline passes, or a stop is requested.
+
+    Returns the (possibly re-armed) watch and the notes that changed — None
+    when the next cycle must be a full scan instead.
+    """
+    if watch is None:
+        stopping.wait(DAEMON_POLL)
+        return None, None
+
+    while not stopping.is_set():
+        if not watch.alive or watch.path != layout.shard(NEEDS_ACTION):
+            # Folder moved/deleted, or the day rolled over to a new shard — re-arm
+            watch.close()
+            return open_task_watch(), None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return watch, None
+        if watch.wait(min(1.0, remaining)):
+            if (changed := watch.take_changes()) is None:
+                return watch, None  # events were lost
+            # Our own temp files come and go here too — only notes count
+            if changed := {p for p in changed if p.suffix == ".md" and not p.name.startswith(".")}:
+                return watch, changed
+    return watch, set()
+
+
+def run_daemon() -> None:
+    """Stay resident: process new tasks and approvals as they land until SIGTERM or Ctrl+C."""
+    print_banner("daemon")
+    open_vault()
+    recover_moves()
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    watch = open_task_watch()
+    logger.info("  Watching /Needs_Action and /Approved...")
+
+    cycle = 0
+    changed = None  # the first cycle is a full scan
+    deadline = 0.0
+    while not stopping.is_set():
+        cycle += 1
+        if changed is None or time.monotonic() >= deadline:
+            changed = None
+            deadline = time.monotonic() + DAEMON_RESCAN
+        try:
+            if result := run_cycle(changed=changed):
+                log_summary(*result)
+        except Exception as e:
+            logger.error(f"Unexpected error in cycle {cycle}: {e}", exc_info=True)
+            stopping.wait(DAEMON_POLL)
+        watch, changed = wait_for_tasks(watch, deadline)
+
+    shutdown_pool()
+    if watch:
+        watch.close()
+    note_moves.flush()
+    counters.save()
+    task_index.save()
+    approved_recipients.save()
+    logger.warning("Reasoning loop daemon stopped")
+
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Bronze Tier Reasoning Loop — processes pending tasks from /Needs_Action"
@@ -350,7 +909,22 @@ def parse_args():
         "--file", type=str, default=None,
         help="Process a specific file (e.g. --file tpy_processed.md)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs", type=int, default=JOBS,
+        help=f"Worker processes evaluating tasks (default: {JOBS})"
+    )
+    parser.add_argument(
+        "--durability", choices=DURABILITY_LEVELS, default=DURABILITY,
+        help="fsync policy: none, batch (group commit per run), always (default: batch)"
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="Stay running and process tasks as they arrive (stop with SIGTERM or Ctrl+C)"
+    )
+    args = parser.parse_args()
+    if args.daemon and args.file:
+        parser.error("--file cannot be combined with --daemon")
+    return args
 
 
 if __name__ == "__main__":
@@ -360,8 +934,14 @@ if __name__ == "__main__":
     INBOX = VAULT_PATH / "Inbox"
     NEEDS_ACTION = VAULT_PATH / "Needs_Action"
     DONE = VAULT_PATH / "Done"
+    APPROVED = VAULT_PATH / "Approved"
     LOGS = VAULT_PATH / "Logs"
     LOG_FILE = LOGS / "reasoning.log"
+    DURABILITY = args.durability
+    JOBS = max(1, args.jobs)
 
     setup_logging()
-    run_reasoning_loop(target=args.file)
+    if args.daemon:
+        run_daemon()
+    else:
+        run_reasoning_loop(target=args.file)
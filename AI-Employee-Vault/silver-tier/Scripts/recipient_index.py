@@ -0,0 +1,111 @@
+"""
+Approved-recipient index for the handbook's "first time per recipient" rule.
+Recipients are pulled from a task's text (email addresses, plus `To:` /
+`Recipient:` / `Vendor:` / `Payee:` / `Client:` lines), normalized, and
+checked against the set of recipients a human has already approved — one dict
+lookup each. The set lives in /.state and only grows from approved tasks.
+"""
+
+from pathlib import Path
+import json
+import os
+import re
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+FIELD_RE = re.compile(r"^[ \t>*_-]*(?:to|recipients?|vendor|payee|client)[ \t*_]*:[ \t*_]*(.+)$",
+                      re.IGNORECASE | re.MULTILINE)
+INDEX_VERSION = 1
+
+
+def normalize(name: str) -> str:
+    """Case- and whitespace-insensitive form of a recipient name."""
+    return " ".join(name.strip(" \t\"'`<>[]()*_.").lower().split())
+
+
+def extract_recipients(content: str) -> frozenset[str]:
+    """Every recipient named in the text: email addresses, and names on recipient lines."""
+    found = {email.lower() for email in EMAIL_RE.findall(content)}
+    for match in FIELD_RE.finditer(content):
+        value = match.group(1)
+        if EMAIL_RE.search(value):
+            continue  # `To: Jane <jane@acme.com>` — the address already counts
+        for part in re.split(r"[,;]", value):
+            if name := normalize(part):
+                found.add(name)
+    return frozenset(found)
+
+
+def format_recipients(recipients: frozenset[str]) -> str:
+    """Frontmatter form: sorted and comma-separated (normalized names never contain commas)."""
+    return ", ".join(sorted(recipients))
+
+
+def parse_recipients(value: str) -> frozenset[str]:
+    return frozenset(part for part in (p.strip() for p in value.split(",")) if part)
+
+
+class ApprovedRecipients:
+    """Recipients a human has approved at least once, persisted in /.state.
+
+    Lookups are against an in-memory dict; refresh() costs one stat while the
+    file is unchanged, so worker processes and the other scripts pick up new
+    approvals. add() only stages — staged recipients join the set when save()
+    runs at the end of a cycle, so every task in one cycle is judged against
+    the same set whether it was evaluated here or in a worker.
+    """
+
+    def __init__(self, state_file: Path):
+        self.state_file = state_file
+        self.approved: dict[str, list[str]] = {}  # recipient -> [approved at, task note]
+        self.staged: dict[str, list[str]] = {}
+        self.stat_key: tuple[int, int] | None = None
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Reload if the file changed since it was last read or written."""
+        try:
+            st = os.stat(self.state_file)
+            stat_key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return
+        if stat_key == self.stat_key:
+            return
+        self.stat_key = stat_key
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if state.get("version") == INDEX_VERSION:
+            self.approved = dict(state.get("recipients", {}))
+
+    def covers(self, recipients: frozenset[str]) -> bool:
+        """True when there is at least one recipient and every one was approved before."""
+        return bool(recipients) and all(r in self.approved for r in recipients)
+
+    def add(self, recipients: frozenset[str], task: str, when: str) -> list[str]:
+        """Stage recipients from a human-approved task. Returns the ones not seen before."""
+        new = []
+        for recipient in sorted(recipients):
+            if recipient not in self.approved and recipient not in self.staged:
+                self.staged[recipient] = [when, task]
+                new.append(recipient)
+        return new
+
+    def save(self) -> None:
+        """Merge staged recipients into the on-disk set atomically — skipped when none are staged."""
+        if not self.staged:
+            return
+        self.refresh()  # keep approvals another process saved meanwhile
+        for recipient, entry in self.staged.items():
+            self.approved.setdefault(recipient, entry)
+        state = {"version": INDEX_VERSION, "recipients": self.approved}
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(state, indent=1, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.state_file)
+            st = os.stat(self.state_file)
+            self.stat_key = (st.st_mtime_ns, st.st_size)
+            self.staged.clear()
+        except OSError:
+            pass  # staged entries are retried on the next save
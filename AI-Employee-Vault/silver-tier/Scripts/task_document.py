@@ -0,0 +1,88 @@
+"""
+Task note model for the reasoning loop and the pipeline.
+A note is parsed once into its frontmatter and body; edits are made in memory
+and written out in a single serialize() — instead of one regex pass and one
+whole-string copy per frontmatter key and log entry.
+"""
+
+import re
+
+FRONTMATTER_RE = re.compile(r"^(---\s*\n)(.*?)(\n---)", re.DOTALL)
+ACTION_LOG = "## Action Log"
+FULL_CONTENT = "## Full Content"  # the dropped file's text, as the watcher wraps it
+
+
+class TaskDocument:
+    """A task note: frontmatter fields and the body, with pending action-log entries.
+
+    Untouched text is kept verbatim, and a note that was not edited serializes
+    to exactly the text it was parsed from. Edits follow the note format the
+    scripts have always written: set() rewrites every `key:` line (or appends
+    one), and log() entries go directly under the first "## Action Log"
+    heading, newest first — a section is appended at the end if the note has
+    none. Notes without frontmatter take log entries but ignore set().
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.new_entries: list[str] = []
+        self.changed = False
+
+        match = FRONTMATTER_RE.match(text)
+        if match:
+            self.opening, fm_text, self.closing = match.groups()
+            self.fm_lines = fm_text.split("\n")
+            self.body = text[match.end():]
+        else:
+            self.opening, self.closing = None, ""
+            self.fm_lines = []
+            self.body = text
+
+        self.frontmatter: dict[str, str] = {}
+        for line in self.fm_lines:
+            if ":" in line:
+                key, val = line.split(":", 1)
+                self.frontmatter[key.strip()] = val.strip()
+
+    # ── frontmatter ──
+    def get(self, key: str, default: str = "") -> str:
+        return self.frontmatter.get(key, default)
+
+    def set(self, updates: dict) -> None:
+        """Update or add frontmatter keys."""
+        if self.opening is None:
+            return
+        for key, val in updates.items():
+            line = f"{key}: {val}"
+            prefix = key + ":"
+            hits = [i for i, existing in enumerate(self.fm_lines) if existing.startswith(prefix)]
+            for i in hits:
+                self.fm_lines[i] = line
+            if not hits:
+                self.fm_lines.append(line)
+            self.frontmatter[key.strip()] = str(val).strip()
+            self.changed = True
+
+    # ── action log ──
+    def log(self, entry: str, timestamp: str) -> None:
+        self.new_entries.append(f"- [{timestamp}] {entry}")
+        self.changed = True
+
+    # ── output ──
+    def _head(self) -> str:
+        return "" if self.opening is None else self.opening + "\n".join(self.fm_lines) + self.closing
+
+    def serialize(self) -> str:
+        if not self.changed:
+            return self.text
+
+        text = self._head() + self.body
+        if self.new_entries:
+            inserted = "".join(f"\n{entry}" for entry in reversed(self.new_entries))
+            pos = text.find(ACTION_LOG)  # the first occurrence, wherever it is — as always
+            if pos < 0:
+                text += f"\n{ACTION_LOG}{inserted}\n"
+            else:
+                pos += len(ACTION_LOG)
+                text = text[:pos] + inserted + text[pos:]
+        return text
@@ -0,0 +1,164 @@
+"""
+Persistent task-status index for /Needs_Action.
+Maps each note to the frontmatter fields the reasoning loop filters on, keyed
+by (inode, mtime, size) — so a run only opens notes that are new or changed
+since the last one, and weeks-old awaiting_approval tasks are never re-read.
+
+On disk it is a marshal snapshot followed by an append-only log of changes,
+one length-prefixed frame per save: loading is one C-level decode plus a
+short replay, and saving appends only what changed. The log is folded into
+a fresh snapshot once it grows large.
+"""
+
+from pathlib import Path
+from typing import NamedTuple
+import marshal
+import os
+import struct
+import time
+
+INDEX_VERSION = 1
+RACY_NS = 2_000_000_000  # notes modified this recently are not cached (mtime granularity)
+COMPACT_MIN = 4096  # log records always tolerated before the snapshot is rewritten
+FRAME = struct.Struct("<I")  # length prefix of each marshal frame
+
+
+def frame(value) -> bytes:
+    payload = marshal.dumps(value)
+    return FRAME.pack(len(payload)) + payload
+
+
+def iter_frames(data: memoryview):
+    """Yield each complete frame's payload — stopping at a truncated one."""
+    offset = 0
+    while offset + FRAME.size <= len(data):
+        (length,) = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        if offset + length > len(data):
+            return
+        yield data[offset:offset + length]
+        offset += length
+
+
+class TaskRecord(NamedTuple):
+    inode: int
+    mtime_ns: int
+    size: int
+    status: str
+    original: str
+    detected: str
+    recipients: str  # set on notes flagged only for a first-time recipient
+
+
+class TaskIndex:
+    """On-disk cache of note frontmatter, validated against one scandir's stats.
+
+    Keys are note paths relative to /Needs_Action (so date shards work too).
+    A record is trusted only while the note's inode, mtime and size are all
+    unchanged; anything else is a miss and the caller re-reads the header.
+    Stats must come from os.stat(), not DirEntry.stat() — on Windows the
+    latter always reports st_ino as 0.
+
+    Every record carries the stamp it was read under, so records appended by
+    another process are as trustworthy as our own — the log needs no locking.
+    A torn final frame (a crash mid-append) ends the replay, and the next
+    save rewrites the snapshot.
+    """
+
+    def __init__(self, state_file: Path):
+        self.state_file = state_file
+        self.records: dict[str, TaskRecord] = {}
+        self.changes: dict[str, TaskRecord | None] = {}  # unsaved — None marks a removal
+        self.log_records = 0
+        self.compact_needed = True  # until a valid snapshot has been read
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = memoryview(self.state_file.read_bytes())
+        except OSError:
+            return
+        offset = 0
+        for n, payload in enumerate(iter_frames(data)):
+            try:
+                if n == 0:
+                    version, marshal_version, snapshot = marshal.loads(payload)
+                    if (version, marshal_version) != (INDEX_VERSION, marshal.version):
+                        return
+                    self.records = dict(zip(snapshot.keys(), map(TaskRecord._make, snapshot.values())))
+                    self.compact_needed = False
+                else:
+                    for key, fields in marshal.loads(payload).items():
+                        self.log_records += 1
+                        if fields is None:
+                            self.records.pop(key, None)
+                        else:
+                            self.records[key] = TaskRecord._make(fields)
+            except (EOFError, ValueError, TypeError):
+                break
+            offset += FRAME.size + len(payload)
+        if offset < len(data):
+            # Torn tail — frames appended after it would never be replayed
+            self.compact_needed = True
+
+    def lookup(self, key: str, st: os.stat_result) -> TaskRecord | None:
+        record = self.records.get(key)
+        if (record is not None and record.mtime_ns == st.st_mtime_ns
+                and record.size == st.st_size and record.inode == st.st_ino):
+            return record
+        return None
+
+    def get(self, key: str) -> TaskRecord | None:
+        """The last record for key, whether or not the note changed since."""
+        return self.records.get(key)
+
+    def update(self, key: str, st: os.stat_result, fm: dict) -> TaskRecord:
+        """Record freshly parsed frontmatter for a note."""
+        record = TaskRecord(
+            st.st_ino, st.st_mtime_ns, st.st_size,
+            fm.get("status", ""), fm.get("original", ""), fm.get("detected", ""),
+            fm.get("recipients", ""),
+        )
+        if time.time_ns() - st.st_mtime_ns < RACY_NS:
+            # Could still change within the same mtime tick — re-read next time
+            self.forget(key)
+        elif self.records.get(key) != record:
+            self.records[key] = record
+            self.changes[key] = record
+        return record
+
+    def forget(self, key: str) -> None:
+        if self.records.pop(key, None) is not None:
+            self.changes[key] = None
+
+    def retain(self, keys: set[str]) -> None:
+        """Drop records for notes no longer present (after a full scan)."""
+        for key in self.records.keys() - keys:
+            del self.records[key]
+            self.changes[key] = None
+
+    def save(self) -> None:
+        """Append the changes since the last save — skipped when there are none."""
+        if not self.changes and not self.compact_needed:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            if self.compact_needed or self.log_records + len(self.changes) > max(COMPACT_MIN, len(self.records) // 4):
+                self._compact()
+            else:
+                # One write call, so concurrent appenders never interleave mid-frame
+                with self.state_file.open("ab") as f:
+                    f.write(frame({key: None if record is None else tuple(record)
+                                   for key, record in self.changes.items()}))
+                self.log_records += len(self.changes)
+            self.changes.clear()
+        except OSError:
+            pass  # the index is a cache — the next run re-reads headers
+
+    def _compact(self) -> None:
+        tmp = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        snapshot = {key: tuple(record) for key, record in self.records.items()}
+        tmp.write_bytes(frame((INDEX_VERSION, marshal.version, snapshot)))
+        os.replace(tmp, self.state_file)
+        self.log_records = 0
+        self.compact_needed = False
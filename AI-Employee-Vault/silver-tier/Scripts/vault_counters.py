@@ -0,0 +1,197 @@
+"""
+Shared folder counters for the watcher and the reasoning loop.
+Counts are maintained from the transitions the scripts perform (create, move,
+delete) instead of recounting /Inbox, /Needs_Action and /Done every cycle.
+A folder is only recounted when its mtime shows someone else touched it, or
+when the periodic reconcile interval has passed. In the date-sharded layout
+only the shard in use is watched and recounted; older shards are counted
+only by the periodic full reconcile.
+"""
+
+from pathlib import Path
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+from vault_layout import VaultLayout, count_files
+
+RECONCILE_SECONDS = 600  # full recount at least this often, to bound drift
+
+
+class FolderCounters:
+    """File counts per vault folder, plus plain counters such as awaiting_approval.
+
+    For each folder the counter remembers the directory mtime it last agreed
+    with. Our own changes go through transition(), which re-snapshots the mtime
+    afterwards; any other mtime change means an outside writer — that folder
+    alone is recounted. State persists in /.state so the next run (or the other
+    script) starts warm: a persisted count is adopted whenever the folder's
+    mtime still matches the one saved with it.
+    """
+
+    def __init__(self, state_file: Path, folders: dict[str, Path], layout: VaultLayout,
+                 sharded: tuple[str, ...] = (), reconcile_every: float = RECONCILE_SECONDS):
+        self.state_file = state_file
+        self.folders = folders
+        self.layout = layout
+        self.sharded = set(sharded) if layout.sharded else set()
+        self.reconcile_every = reconcile_every
+        self.counts: dict[str, int] = {}
+        self.mtimes: dict[str, int] = {}
+        self.watched: dict[str, str] = {}  # key -> folder/shard whose mtime is tracked
+        self.bases: dict[str, int] = {}  # sharded keys: files outside the watched shard
+        self.stale: set[str] = set()
+        self.owned: set[str] = set()  # plain counters this process maintains itself
+        self.reconciled_at = 0.0
+        self.state_mtime = 0
+        self.locks = {key: threading.Lock() for key in folders}
+        self.lock = threading.Lock()
+        self._load_state()
+
+    # ── persistence ──
+    def _load_state(self) -> None:
+        try:
+            st = self.state_file.stat()
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.state_mtime = st.st_mtime_ns
+
+        with self.lock:
+            self.reconciled_at = max(self.reconciled_at, state.get("reconciled_at", 0.0))
+            for key, count in state.get("counts", {}).items():
+                if key not in self.folders:
+                    if key not in self.owned:
+                        self.counts[key] = count
+                    continue
+                saved_mtime = state.get("mtimes", {}).get(key)
+                saved_watch = state.get("watched", {}).get(key)
+                if (saved_mtime is not None and saved_mtime == self._mtime(key)
+                        and saved_watch == str(self._watch_dir(key))):
+                    self.counts[key] = count
+                    self.mtimes[key] = saved_mtime
+                    self.watched[key] = saved_watch
+                    if key in self.sharded:
+                        self.bases[key] = state.get("bases", {}).get(key, 0)
+                    self.stale.discard(key)
+
+    def save(self) -> None:
+        """Persist counts + folder mtimes atomically for the next run."""
+        with self.lock:
+            state = {
+                "counts": dict(self.counts),
+                "mtimes": dict(self.mtimes),
+                "watched": dict(self.watched),
+                "bases": dict(self.bases),
+                "reconciled_at": self.reconciled_at,
+            }
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp, self.state_file)
+            self.state_mtime = self.state_file.stat().st_mtime_ns
+        except OSError:
+            pass  # counters are a cache — the next run simply reconciles
+
+    # ── folder bookkeeping ──
+    def _watch_dir(self, key: str) -> Path:
+        """The folder itself, or the shard currently written to."""
+        if key in self.sharded:
+            return self.layout.shard(self.folders[key])
+        return self.folders[key]
+
+    def _mtime(self, key: str) -> int | None:
+        try:
+            return os.stat(self._watch_dir(key)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _recount(self, key: str, full: bool) -> None:
+        watch = self._watch_dir(key)
+        mtime = self._mtime(key)
+        if key not in self.sharded:
+            self.counts[key] = count_files(watch)
+        elif full or key not in self.bases:
+            total = self.layout.count_files(self.folders[key])
+            self.bases[key] = total - count_files(watch)
+            self.counts[key] = total
+        else:
+            if self.watched.get(key) != str(watch):
+                # Day rolled over — everything counted so far lives in older shards
+                self.bases[key] = self.counts.get(key, 0)
+            self.counts[key] = self.bases[key] + count_files(watch)
+        self.mtimes[key] = mtime
+        self.watched[key] = str(watch)
+        self.stale.discard(key)
+
+    @contextmanager
+    def transition(self, key: str, delta: int, where: Path | None = None):
+        """Wrap one of our own changes to a folder; applies delta if it succeeds.
+
+        where is the directory actually touched, when it may be an older shard.
+        """
+        with self.locks[key]:
+            before = self._mtime(key)
+            yield
+            after = self._mtime(key)
+            with self.lock:
+                watch = str(self._watch_dir(key))
+                if key in self.sharded and self.watched.get(key, watch) != watch:
+                    # Day rolled over — everything counted so far lives in older shards
+                    self.bases[key] = self.counts.get(key, 0)
+                    self.watched[key] = watch
+                    self.stale.add(key)
+                elif before != self.mtimes.get(key):
+                    self.stale.add(key)  # touched by someone else since we last looked
+                self.counts[key] = self.counts.get(key, 0) + delta
+                if key in self.sharded and where is not None and str(where) != watch:
+                    self.bases[key] = self.bases.get(key, 0) + delta
+                self.mtimes[key] = after
+
+    def observe(self, key: str, count: int, mtime: int | None, watched_count: int | None = None) -> None:
+        """Record a count from a listing the caller already did (mtime taken before listing).
+
+        For sharded folders, watched_count is how many of those files sit in the current shard.
+        """
+        with self.lock:
+            self.counts[key] = count
+            self.mtimes[key] = mtime
+            self.watched[key] = str(self._watch_dir(key))
+            if key in self.sharded:
+                self.bases[key] = count - (watched_count or 0)
+            self.stale.discard(key)
+
+    # ── plain counters ──
+    def set(self, key: str, value: int) -> None:
+        with self.lock:
+            self.counts[key] = value
+            self.owned.add(key)
+
+    def adjust(self, key: str, delta: int) -> None:
+        with self.lock:
+            self.counts[key] = max(0, self.counts.get(key, 0) + delta)
+            self.owned.add(key)
+
+    def current(self) -> dict[str, int]:
+        """Counts for every key — O(1) per folder unless it changed behind our back."""
+        try:
+            state_mtime = self.state_file.stat().st_mtime_ns
+        except OSError:
+            state_mtime = 0
+        if state_mtime != self.state_mtime:
+            self._load_state()  # the other script saved fresher counts
+
+        now = time.time()
+        full = now - self.reconciled_at >= self.reconcile_every
+        with self.lock:
+            for key in self.folders:
+                if (full or key in self.stale or key not in self.counts
+                        or self.watched.get(key) != str(self._watch_dir(key))
+                        or self._mtime(key) != self.mtimes.get(key)):
+                    self._recount(key, full)
+            if full:
+                self.reconciled_at = now
+            return dict(self.counts)
@@ -0,0 +1,288 @@
+"""
+Shared vault I/O helpers for the watcher and the reasoning loop.
+  - DurableWriter: temp-file + rename writes, folder fsyncs group-committed per cycle
+  - NameAllocator: O(1) collision-free note names per folder, claimed without overwrite
+"""
+
+from pathlib import Path
+from typing import Callable, TextIO
+import errno
+import itertools
+import os
+import re
+import threading
+import time
+
+DURABILITY_LEVELS = ("none", "batch", "always")
+
+
+# ── Durable Writes ────────────────────────────────────────────────────────────
+def fsync_path(path: Path) -> None:
+    """Flush a file to disk. Read-only on POSIX, so 0444 files (moved-in attachments) work;
+    Windows cannot flush without write access."""
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(folder: Path) -> None:
+    """Persist a folder's entries (renames, links). No-op where unsupported (Windows)."""
+    if os.name == "nt":
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DurableWriter:
+    """Atomic vault writes with a configurable durability level.
+
+    Every file is written to a hidden temp file in its target folder and
+    renamed (or linked) into place, so readers only ever see the old or the
+    new version. Under batch and always the temp file is fsynced before the
+    rename, so a crash cannot leave a truncated note in place of one that was
+    already on disk either.
+
+      none   — atomic rename only, no fsync (a crash may truncate recent writes)
+      batch  — each file is fsynced before its rename; the folder fsyncs that
+               make the renames durable are group-committed in commit(), once
+               per cycle, together with files moved in by other means
+      always — fsync the file before the rename and the folder after, per write
+
+    Destructive follow-ups (deleting a source once its copy exists) are
+    registered with after_commit() and run only once the copy is durable. If a
+    commit fails, whatever it could not flush and every follow-up go back in the
+    queue for the next commit — nothing is deleted early, nothing is dropped.
+    """
+    _temp_ids = itertools.count()
+
+    def __init__(self, level: str = "batch"):
+        if level not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {level}")
+        self.level = level
+        self.pending_files: list[Path] = []
+        self.pending_dirs: set[Path] = set()
+        self.callbacks: list[Callable[[], None]] = []
+        self.lock = threading.Lock()
+
+    def open_temp(self, folder: Path) -> tuple[Path, TextIO]:
+        """Open a fresh hidden temp file in folder (same filesystem as the target)."""
+        tmp = folder / f".{os.getpid()}-{next(self._temp_ids)}.tmp"
+        return tmp, tmp.open("x", encoding="utf-8")
+
+    def published(self, path: Path) -> None:
+        """Record that path was just renamed/linked into place (its data already fsynced)."""
+        if self.level == "always":
+            fsync_dir(path.parent)
+        elif self.level == "batch":
+            with self.lock:
+                self.pending_dirs.add(path.parent)
+
+    def unlinked(self, path: Path) -> None:
+        """Record that an entry was renamed out of (or deleted from) path's folder."""
+        if self.level == "always":
+            fsync_dir(path.parent)
+        elif self.level == "batch":
+            with self.lock:
+                self.pending_dirs.add(path.parent)
+
+    def before_publish(self, tmp: Path) -> None:
+        """Flush a finished file before it is renamed over (or linked to) its real name."""
+        if self.level != "none":
+            fsync_path(tmp)
+
+    def replace(self, tmp: Path, dest: Path) -> None:
+        """Atomically move a finished temp file over dest."""
+        self.before_publish(tmp)
+        os.replace(tmp, dest)
+        self.published(dest)
+
+    def write_text(self, path: Path, text: str) -> None:
+        """Atomically replace path with text."""
+        tmp, out = self.open_temp(path.parent)
+        try:
+            with out:
+                out.write(text)
+            self.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def track_move(self, dest: Path) -> None:
+        """Include a file moved by other means (e.g. an attachment rename) in the next commit."""
+        if self.level == "batch":
+            with self.lock:
+                self.pending_files.append(dest)
+        self.published(dest)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once everything written so far is durable."""
+        if self.level != "batch":
+            callback()
+            return
+        with self.lock:
+            self.callbacks.append(callback)
+
+    @staticmethod
+    def sweep_temps(folder: Path, max_age: float = 3600) -> int:
+        """Delete temp files left behind by a crashed writer. Returns how many were removed."""
+        removed = 0
+        cutoff = time.time() - max_age
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.startswith(".") and entry.name.endswith(".tmp"):
+                        try:
+                            if entry.stat().st_mtime < cutoff:
+                                os.unlink(entry.path)
+                                removed += 1
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+        return removed
+
+    def has_pending(self) -> bool:
+        with self.lock:
+            return bool(self.pending_files or self.pending_dirs or self.callbacks)
+
+    def commit(self) -> None:
+        """Group commit: fsync every moved-in file, then each folder once, then run callbacks.
+
+        Raises the first fsync error after re-queueing what failed and all callbacks.
+        """
+        with self.lock:
+            files, dirs, callbacks = self.pending_files, self.pending_dirs, self.callbacks
+            self.pending_files, self.pending_dirs, self.callbacks = [], set(), []
+
+        error: OSError | None = None
+        failed_files: list[Path] = []
+        failed_dirs: set[Path] = set()
+        for path in files:
+            try:
+                fsync_path(path)
+            except FileNotFoundError:
+                pass  # already moved on (e.g. completed and archived in this cycle)
+            except OSError as e:
+                failed_files.append(path)
+                error = error or e
+        for folder in dirs:
+            try:
+                fsync_dir(folder)
+            except OSError as e:
+                failed_dirs.add(folder)
+                error = error or e
+        if error is not None:
+            with self.lock:
+                self.pending_files[:0] = failed_files
+                self.pending_dirs |= failed_dirs
+                self.callbacks[:0] = callbacks
+            raise error
+        for callback in callbacks:
+            callback()
+
+
+# ── Name Allocation ───────────────────────────────────────────────────────────
+class NameAllocator:
+    """Hands out collision-free `base.md` / `base_N.md` names in one folder.
+
+    Built from a single directory listing, then updated incrementally: every
+    name in the folder sits in a set, and each base keeps a high-water counter,
+    so a recurring stem costs O(1) instead of one stat per earlier copy. The
+    set mirrors the folder, not history — when the folder's mtime shows that
+    something else changed it (the reasoning loop moving notes out, a manual
+    edit), the set is rebuilt, so it never outgrows the folder and freed names
+    are reused. The final claim is a no-clobber os.link (or an O_EXCL create),
+    so names taken behind our back between listings are detected and skipped —
+    never overwritten.
+    """
+    NAME_RE = re.compile(r"^(?P<base>.+?)(?:_(?P<n>\d+))?$")
+
+    def __init__(self, folder: Path, suffix: str = ".md"):
+        self.folder = folder
+        self.suffix = suffix
+        self.names: set[str] = set()
+        self.next_counter: dict[str, int] = {}
+        self.folder_mtime: int | None = None  # as of the last listing or our own last claim
+        self.lock = threading.Lock()
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.names.clear()
+        self.next_counter.clear()
+        self.folder_mtime = os.stat(self.folder).st_mtime_ns  # before listing: a change mid-listing shows next time
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                if entry.name.endswith(self.suffix):
+                    self._note(entry.name)
+
+    def _sync(self) -> None:
+        """Rebuild from a fresh listing if the folder changed since we last looked."""
+        if os.stat(self.folder).st_mtime_ns != self.folder_mtime:
+            self._rebuild()
+
+    def _note(self, name: str) -> None:
+        """Record an existing name and push its base's counter past it."""
+        self.names.add(name)
+        match = self.NAME_RE.match(name[:-len(self.suffix)])
+        if match and match.group("n"):
+            base, n = match.group("base"), int(match.group("n"))
+            if n >= self.next_counter.get(base, 1):
+                self.next_counter[base] = n + 1
+
+    def _candidate(self, base: str) -> str:
+        plain = base + self.suffix
+        if plain not in self.names:
+            return plain
+        n = self.next_counter.get(base, 1)
+        while f"{base}_{n}{self.suffix}" in self.names:
+            n += 1
+        self.next_counter[base] = n
+        return f"{base}_{n}{self.suffix}"
+
+    def publish(self, tmp: Path, base: str, durable: DurableWriter) -> Path:
+        """Move a finished temp file to the first free name for base; returns the final path.
+
+        os.link never overwrites, which makes it the atomic claim; where hard
+        links are unsupported, an O_EXCL placeholder is claimed and replaced.
+        tmp may also be a finished note in another folder of the same
+        filesystem — the move is then metadata-only, no data is copied.
+        """
+        durable.before_publish(tmp)
+        with self.lock:
+            self._sync()
+            while True:
+                name = self._candidate(base)
+                path = self.folder / name
+                try:
+                    self._link_or_claim(tmp, path)
+                except FileExistsError:
+                    self._note(name)
+                    continue
+                self._note(name)
+                break
+            # Our own claim changed the mtime — a change by anyone else shows up as a mismatch
+            self.folder_mtime = os.stat(self.folder).st_mtime_ns
+        durable.published(path)
+        if tmp.parent != path.parent:
+            durable.unlinked(tmp)
+        return path
+
+    @staticmethod
+    def _link_or_claim(tmp: Path, path: Path) -> None:
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            raise
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EXDEV, errno.EMLINK):
+                raise
+            with path.open("x"):
+                pass
+            os.replace(tmp, path)
+            return
+        tmp.unlink()
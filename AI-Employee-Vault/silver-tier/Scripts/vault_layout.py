@@ -0,0 +1,224 @@
+"""
+Vault folder layout shared by the watcher and the reasoning loop.
+  - flat  — every note directly in /Needs_Action and /Done (default)
+  - daily — notes sharded by date: /Done/2026/10/17/<note>.md
+
+The layout is a property of the vault, recorded in /.state/layout.json by the
+one-time migration below — both scripts read it at startup:
+
+    python Scripts/vault_layout.py --vault <path> --migrate daily
+"""
+
+from pathlib import Path
+from datetime import datetime
+import argparse
+import json
+import os
+import re
+import sys
+
+LAYOUTS = ("flat", "daily")
+SHARDED_FOLDERS = ("Needs_Action", "Done")
+DATE_KEYS = ("completed", "detected")  # frontmatter keys used to date existing notes
+
+
+class VaultLayout:
+    """Maps a folder to the shard notes are written to, and enumerates its shards."""
+
+    def __init__(self, vault: Path):
+        self.vault = vault
+        self.state_file = vault / ".state" / "layout.json"
+        try:
+            self.layout = json.loads(self.state_file.read_text(encoding="utf-8")).get("layout", "flat")
+        except (OSError, ValueError):
+            self.layout = "flat"
+        if self.layout not in LAYOUTS:
+            self.layout = "flat"
+
+    @property
+    def sharded(self) -> bool:
+        return self.layout == "daily"
+
+    def shard(self, folder: Path, when: datetime | None = None) -> Path:
+        """The folder new notes go to — the folder itself, or today's date shard."""
+        if not self.sharded:
+            return folder
+        return folder / (when or datetime.now()).strftime("%Y/%m/%d")
+
+    def shards(self, folder: Path) -> list[Path]:
+        """Every shard of folder, oldest first (just the folder itself when flat)."""
+        if not self.sharded:
+            return [folder]
+        found = []
+        for year in sorted_dirs(folder, 4):
+            for month in sorted_dirs(year, 2):
+                found.extend(sorted_dirs(month, 2))
+        return found
+
+    def count_files(self, folder: Path) -> int:
+        return sum(count_files(shard) for shard in self.shards(folder))
+
+    def prune(self, folder: Path, shard: Path) -> None:
+        """Remove shard (and empty month/year parents) once drained — never today's shard."""
+        if not self.sharded or shard == self.shard(folder):
+            return
+        for path in (shard, shard.parent, shard.parent.parent):
+            if path == folder:
+                break
+            try:
+                path.rmdir()
+            except OSError:
+                break  # not empty, or already gone
+
+    def save(self, layout: str) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"layout": layout}), encoding="utf-8")
+        os.replace(tmp, self.state_file)
+        self.layout = layout
+
+
+def sorted_dirs(folder: Path, width: int) -> list[Path]:
+    """Numeric subdirectories of folder with exactly width digits, in order."""
+    try:
+        with os.scandir(folder) as it:
+            names = [e.name for e in it if e.is_dir() and len(e.name) == width and e.name.isdigit()]
+    except OSError:
+        return []
+    return [folder / name for name in sorted(names)]
+
+
+def count_files(folder: Path) -> int:
+    try:
+        with os.scandir(folder) as it:
+            return sum(1 for entry in it if entry.is_file())
+    except OSError:
+        return 0
+
+
+# ── One-time Migration ────────────────────────────────────────────────────────
+def note_date(path: Path) -> datetime:
+    """Date a note by its frontmatter (completed, then detected), else by mtime."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            header = f.read(4096)
+    except (OSError, UnicodeDecodeError):
+        header = ""
+    match = re.match(r"^---\s*\n(.*?)\n---", header, re.DOTALL)
+    if match:
+        fields = dict(
+            (k.strip(), v.strip())
+            for k, v in (line.split(":", 1) for line in match.group(1).split("\n") if ":" in line)
+        )
+        for key in DATE_KEYS:
+            try:
+                return datetime.strptime(fields.get(key, "")[:10], "%Y-%m-%d")
+            except ValueError:
+                continue
+    return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def free_name(folder: Path, name: str) -> Path:
+    dest = folder / name
+    counter = 1
+    while dest.exists():
+        dest = folder / f"{Path(name).stem}_{counter}{Path(name).suffix}"
+        counter += 1
+    return dest
+
+
+def rewrite_links(vault: Path, moves: dict[str, str]) -> int:
+    """Point path-qualified wikilinks ([[Done/x]], [[Done/x.md|alias]]) at the notes' new paths.
+
+    Bare [[x]] links need no change — Obsidian resolves them by file name.
+    """
+    if not moves:
+        return 0
+    folders = "|".join(re.escape(name) for name in SHARDED_FOLDERS)
+    pattern = re.compile(r"\[\[((?:" + folders + r")/[^\]|#]+?)(\.md)?(?=[\]|#])")
+
+    def relink(m: re.Match) -> str:
+        new = moves.get(m.group(1))
+        return m.group(0) if new is None else "[[" + new + (m.group(2) or "")
+
+    rewritten = 0
+    for note in vault.rglob("*.md"):
+        if ".state" in note.parts or ".obsidian" in note.parts:
+            continue
+        try:
+            content = note.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        updated = pattern.sub(relink, content)
+        if updated != content:
+            tmp = note.with_name(f".{note.name}.tmp")
+            tmp.write_text(updated, encoding="utf-8")
+            os.replace(tmp, note)
+            rewritten += 1
+    return rewritten
+
+
+def migrate(vault: Path, target: str) -> None:
+    """Move every note in /Needs_Action and /Done into the target layout."""
+    layout = VaultLayout(vault)
+    moves: dict[str, str] = {}  # old link path (no .md) -> new link path
+    moved = 0
+
+    for folder_name in SHARDED_FOLDERS:
+        folder = vault / folder_name
+        if not folder.is_dir():
+            continue
+
+        # Collect from every shard of the current layout (and any stray flat files)
+        sources = [p for shard in layout.shards(folder) for p in shard.iterdir() if p.is_file()]
+        if layout.sharded:
+            sources += [p for p in folder.iterdir() if p.is_file()]
+
+        for src in sources:
+            if src.name.startswith("."):
+                continue
+            if target == "daily":
+                dest_dir = folder / note_date(src).strftime("%Y/%m/%d")
+            else:
+                dest_dir = folder
+            if src.parent == dest_dir:
+                continue
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            dest = free_name(dest_dir, src.name)
+            os.rename(src, dest)
+            moved += 1
+            old_link = src.relative_to(vault).with_suffix("").as_posix()
+            moves[old_link] = dest.relative_to(vault).with_suffix("").as_posix()
+
+        if layout.sharded and target == "flat":
+            for shard in layout.shards(folder):
+                for path in (shard, shard.parent, shard.parent.parent):
+                    try:
+                        path.rmdir()
+                    except OSError:
+                        break
+
+    relinked = rewrite_links(vault, moves)
+    layout.save(target)
+    print(f"Layout: {target} | notes moved: {moved} | notes relinked: {relinked}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Migrate /Needs_Action and /Done between flat and date-sharded layouts"
+    )
+    parser.add_argument("--vault", type=str, required=True, help="Path to vault root")
+    parser.add_argument(
+        "--migrate", choices=LAYOUTS, required=True,
+        help="Target layout: daily (YYYY/MM/DD shards) or flat"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    vault = Path(args.vault)
+    if not vault.is_dir():
+        print(f"Vault not found: {vault}", file=sys.stderr)
+        sys.exit(1)
+    migrate(vault, args.migrate)
@@ -0,0 +1,121 @@
+"""
+Event-driven folder watching shared by the watcher (/Inbox) and the
+reasoning loop daemon (/Needs_Action shards and /Approved). Linux inotify via ctypes; callers fall
+back to polling wherever it is unavailable.
+"""
+
+from pathlib import Path
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+
+
+class InotifyWatch:
+    """Blocks until a folder receives a finished write or a moved-in file.
+
+    Thin ctypes wrapper over Linux inotify — no third-party dependencies.
+    Raises OSError if inotify is unavailable so callers can fall back to polling.
+
+    More folders can be added with add(); only losing the first one clears
+    `alive`. With collect=True the paths of changed entries are kept for
+    take_changes(), so callers can handle exactly those files.
+    """
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self, path: Path, logger: logging.Logger, events: int = IN_CLOSE_WRITE | IN_MOVED_TO,
+                 collect: bool = False):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is Linux-only")
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "libc has no inotify support")
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+
+        self.libc = libc
+        self.path = path
+        self.logger = logger
+        self.mask = events | self.IN_DELETE_SELF | self.IN_MOVE_SELF
+        self.collect = collect
+        self.folders: dict[int, Path] = {}
+        self.changed: set[Path] = set()
+        self.overflowed = False
+        try:
+            self.primary = self.add(path)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+        self.alive = True
+
+    def add(self, path: Path) -> int:
+        """Watch another folder with the same events. Returns its watch descriptor."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), self.mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch failed on {path}: {os.strerror(err)}")
+        self.folders[wd] = path
+        return wd
+
+    def take_changes(self) -> set[Path] | None:
+        """Paths changed since the last call (collect=True), or None after a queue overflow."""
+        changed, overflowed = self.changed, self.overflowed
+        self.changed, self.overflowed = set(), False
+        return None if overflowed else changed
+
+    def wait(self, timeout: float | None) -> bool:
+        """Sleep until an event arrives or timeout expires. Returns True on events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self._drain()
+        return True
+
+    def _drain(self) -> None:
+        """Consume all queued events — a burst of drops costs one wake-up."""
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            if not data:
+                return
+
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(data):
+                wd, mask, _, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+                start = offset + self.EVENT_HEADER.size
+                offset = start + name_len
+                if mask & (self.IN_IGNORED | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                    if wd == self.primary:
+                        self.alive = False
+                    else:
+                        self.folders.pop(wd, None)
+                if mask & self.IN_Q_OVERFLOW:
+                    self.logger.warning("inotify queue overflow — falling back to full rescan")
+                    self.overflowed = True
+                elif self.collect and name_len and wd in self.folders:
+                    name = os.fsdecode(data[start:offset].rstrip(b"\0"))
+                    self.changed.add(self.folders[wd] / name)
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass